@@ -0,0 +1,289 @@
+"""Benchmark dos endpoints principais com orçamento de consultas SQL.
+
+Sobe a aplicação contra um SQLite populado pelo gerador do `flask seed` e
+exercita os endpoints reais em duas fases:
+
+1. sequencial, pelo test client do Flask, contando os comandos SQL de cada
+   requisição;
+2. carga, com vários processos (como workers do gunicorn) disparando uma
+   mistura das mesmas requisições contra o mesmo arquivo de banco.
+
+Para cada cenário (login, busca de produtos, criação de venda, listagem de
+vendas e relatório resumido) mostra p50/p95/p99 e requisições/s. Termina com
+código 1 se algum cenário passar do orçamento de comandos SQL gravado em
+endpoint_budgets.json ou se o p95 piorar além da tolerância.
+
+Uso:
+    python benchmarks/endpoints.py --sales 20000 --requests 200 --workers 4
+    python benchmarks/endpoints.py --record   # grava o resultado atual como referência
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endpoint_budgets.json')
+
+SEARCH_TERMS = ['cafe', 'caderno', 'sab', 'premium', 'cha', 'organico', 'copo']
+
+# Cenário -> peso na mistura da fase de carga
+SCENARIOS = {
+    'login': 1,
+    'product_search': 4,
+    'sale_create': 2,
+    'sales_list': 3,
+    'sales_summary': 1,
+}
+
+
+def build_app(db_path):
+    from src.main import create_app
+
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'JWT_SECRET_KEY': 'benchmark-secret-key-with-enough-length',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        # O relatório precisa ir ao banco em toda requisição
+        'SUMMARY_CACHE_TTL': 0,
+    })
+
+
+def setup(db_path, args):
+    from src.commands import bootstrap_database
+    from src.models.database import db
+    from src.models.product import Product
+    from src.models.stock import compact_stock, record_movements
+    from src.seed import seed_database
+
+    app = build_app(db_path)
+    with app.app_context():
+        bootstrap_database()
+        seed_database(
+            seed=args.seed, users=args.users, products=args.products, sales=args.sales,
+            echo=lambda message: None
+        )
+        # Estoque alto para que as vendas do benchmark nunca falhem por falta,
+        # lançado no livro como reposição (flask reconcile-stock continua batendo)
+        record_movements([
+            {'product_id': product_id, 'delta': 10 ** 9, 'reason': 'restock'}
+            for product_id in db.session.execute(db.select(Product.id)).scalars()
+        ])
+        compact_stock()
+        db.session.commit()
+
+
+class Client:
+    """Test client autenticado que executa um cenário por chamada."""
+
+    def __init__(self, app, products, seed):
+        self.client = app.test_client()
+        self.products = products
+        self.rng = random.Random(seed)
+        self.admin = self.login('admin', 'admin123')
+
+    def login(self, username, password):
+        response = self.client.post('/api/auth/login', json={'username': username, 'password': password})
+        assert response.status_code == 200, response.get_json()
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    def run(self, scenario):
+        rng = self.rng
+        if scenario == 'login':
+            response = self.client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+        elif scenario == 'product_search':
+            response = self.client.get(
+                f'/api/products/?search={rng.choice(SEARCH_TERMS)}&per_page=20', headers=self.admin
+            )
+        elif scenario == 'sale_create':
+            items = [
+                {'product_id': product_id, 'quantity': rng.randint(1, 3)}
+                for product_id in rng.sample(range(1, self.products + 1), rng.randint(1, 4))
+            ]
+            response = self.client.post('/api/sales/', json={'items': items}, headers=self.admin)
+        elif scenario == 'sales_list':
+            response = self.client.get('/api/sales/?per_page=20&cursor=', headers=self.admin)
+        elif scenario == 'sales_summary':
+            response = self.client.get('/api/sales/reports/summary', headers=self.admin)
+        else:
+            raise ValueError(scenario)
+        if response.status_code not in (200, 201):
+            raise RuntimeError(f'{scenario}: HTTP {response.status_code} {response.get_json()}')
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def sequential(db_path, args):
+    """Fase 1: latência e comandos SQL por requisição, um processo."""
+    from sqlalchemy import event
+    from src.models.database import db
+
+    app = build_app(db_path)
+    results = {}
+    with app.app_context():
+        statements = [0]
+
+        def count(*_):
+            statements[0] += 1
+
+        client = Client(app, args.products, args.seed)
+        event.listen(db.engine, 'before_cursor_execute', count)
+        for scenario in SCENARIOS:
+            # Aquecimento: caches de token, planos de consulta, etc.
+            for _ in range(5):
+                client.run(scenario)
+            timings = []
+            counts = []
+            for _ in range(args.requests):
+                statements[0] = 0
+                began = time.perf_counter()
+                client.run(scenario)
+                timings.append(time.perf_counter() - began)
+                counts.append(statements[0])
+            p50, p95, p99 = percentiles(timings)
+            results[scenario] = {
+                'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99,
+                'rps': len(timings) / sum(timings),
+                'statements': max(counts),
+            }
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return results
+
+
+def load_worker(db_path, args, seed, ready, start, results):
+    app = build_app(db_path)
+    with app.app_context():
+        client = Client(app, args.products, seed)
+    rng = random.Random(seed)
+    names = list(SCENARIOS)
+    weights = list(SCENARIOS.values())
+
+    ready.release()
+    start.wait()
+    timings = {scenario: [] for scenario in SCENARIOS}
+    began = time.perf_counter()
+    for _ in range(args.requests):
+        scenario = rng.choices(names, weights)[0]
+        request_began = time.perf_counter()
+        client.run(scenario)
+        timings[scenario].append(time.perf_counter() - request_began)
+    results.put((timings, time.perf_counter() - began))
+
+
+def load(db_path, args):
+    """Fase 2: vários processos disparando a mistura de cenários."""
+    context = multiprocessing.get_context('spawn')
+    ready = context.Semaphore(0)
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=load_worker, args=(db_path, args, args.seed + n + 1, ready, start, results))
+        for n in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.acquire()
+    start.set()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    elapsed = max(total[1] for total in totals)
+    merged = {scenario: [] for scenario in SCENARIOS}
+    for timings, _ in totals:
+        for scenario, samples in timings.items():
+            merged[scenario].extend(samples)
+    return merged, elapsed
+
+
+def check(results, budgets, tolerance):
+    failures = []
+    for scenario, result in results.items():
+        budget = budgets.get(scenario)
+        if not budget:
+            continue
+        if result['statements'] > budget['statements']:
+            failures.append(
+                f"{scenario}: {result['statements']} comandos SQL (orçamento {budget['statements']})"
+            )
+        limit = budget['p95_ms'] * (1 + tolerance)
+        if result['p95_ms'] > limit:
+            failures.append(
+                f"{scenario}: p95 {result['p95_ms']:.1f}ms (referência {budget['p95_ms']:.1f}ms, "
+                f"limite {limit:.1f}ms)"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--sales', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=200, help='requisições por cenário (fase 1) e por processo (fase 2)')
+    parser.add_argument('--workers', type=int, default=4, help='processos na fase de carga (0 desliga)')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='piora aceita no p95 (0.5 = 50%%)')
+    parser.add_argument('--budgets', default=BUDGETS_FILE)
+    parser.add_argument('--record', action='store_true', help='grava o resultado atual como referência')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        began = time.perf_counter()
+        setup(db_path, args)
+        print(f'Banco populado em {time.perf_counter() - began:.1f}s '
+              f'({args.sales} vendas, {args.products} produtos)')
+
+        results = sequential(db_path, args)
+        print(f"\n{'sequencial':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'SQL':>6}")
+        for scenario, result in results.items():
+            print(f"{scenario:<16}{result['p50_ms']:8.1f}ms{result['p95_ms']:7.1f}ms"
+                  f"{result['p99_ms']:7.1f}ms{result['rps']:9.0f}{result['statements']:6d}")
+
+        if args.workers:
+            merged, elapsed = load(db_path, args)
+            total = sum(len(samples) for samples in merged.values())
+            print(f"\n{f'carga ({args.workers} processos)':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'req':>7}")
+            for scenario, samples in merged.items():
+                if samples:
+                    p50, p95, p99 = percentiles(samples)
+                    print(f'{scenario:<24}{p50:8.1f}ms{p95:7.1f}ms{p99:7.1f}ms{len(samples):7d}')
+            print(f'total: {total} requisições em {elapsed:.2f}s ({total / elapsed:.0f} req/s)')
+
+    if args.record:
+        budgets = {
+            scenario: {'statements': result['statements'], 'p95_ms': round(result['p95_ms'], 2)}
+            for scenario, result in results.items()
+        }
+        with open(args.budgets, 'w') as budgets_file:
+            json.dump(budgets, budgets_file, indent=2, sort_keys=True)
+            budgets_file.write('\n')
+        print(f'\nReferência gravada em {args.budgets}')
+        return
+
+    if not os.path.exists(args.budgets):
+        print(f'\nSem referência em {args.budgets}; rode com --record para gravar uma.')
+        return
+    with open(args.budgets) as budgets_file:
+        failures = check(results, json.load(budgets_file), args.tolerance)
+    if failures:
+        print('\nFALHOU:')
+        for failure in failures:
+            print(f'  {failure}')
+        sys.exit(1)
+    print('\nDentro do orçamento de consultas e latência.')
+
+
+if __name__ == '__main__':
+    main()
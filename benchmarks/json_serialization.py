@@ -0,0 +1,97 @@
+"""Micro-benchmark da serialização JSON de uma página de vendas.
+
+Monta 1000 vendas (5 itens cada) em memória, sem banco, e mede o tempo do
+to_dict() e de cada provider de JSON gerando a resposta: o provider padrão
+do Flask, o StdlibJSONProvider do projeto e o OrjsonJSONProvider (se o
+orjson estiver instalado).
+
+Uso:
+    python benchmarks/json_serialization.py --sales 1000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_sales(count, items_per_sale):
+    from src.models.user import User
+    from src.models.product import Product
+    from src.models.sale import Sale, SaleItem
+
+    user = User(id=1, username='caixa', role='funcionario')
+    products = [Product(id=i, name=f'Produto {i}', price_cents=990 + 100 * i) for i in range(1, 51)]
+    start = datetime(2026, 1, 1, 8, 0, 0)
+    sales = []
+    for sale_id in range(1, count + 1):
+        items = [
+            SaleItem(
+                id=sale_id * 10 + n,
+                sale_id=sale_id,
+                product_id=products[(sale_id + n) % 50].id,
+                product=products[(sale_id + n) % 50],
+                quantity=n + 1,
+                price_at_sale_cents=products[(sale_id + n) % 50].price_cents,
+            )
+            for n in range(items_per_sale)
+        ]
+        sales.append(Sale(
+            id=sale_id,
+            user_id=user.id,
+            user=user,
+            total_cents=sum(item.price_at_sale_cents * item.quantity for item in items),
+            timestamp=start + timedelta(seconds=37 * sale_id),
+            items=items,
+        ))
+    return sales
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - began) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sales', type=int, default=1000)
+    parser.add_argument('--items', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+    from src.utils.json_provider import OrjsonJSONProvider, StdlibJSONProvider, orjson
+
+    app = Flask(__name__)
+    sales = build_sales(args.sales, args.items)
+
+    def page():
+        return {'sales': [sale.to_dict() for sale in sales], 'total': len(sales), 'pages': 1, 'current_page': 1}
+
+    print(f'{"to_dict()":>22}: {measure(page, args.repeat):8.2f} ms')
+
+    data = page()
+    providers = [('Flask (padrão)', DefaultJSONProvider), ('StdlibJSONProvider', StdlibJSONProvider)]
+    if orjson is not None:
+        providers.append(('OrjsonJSONProvider', OrjsonJSONProvider))
+    else:
+        print('orjson não instalado: OrjsonJSONProvider ignorado')
+
+    with app.app_context():
+        for name, provider_class in providers:
+            provider = provider_class(app)
+            elapsed = measure(lambda: provider.response(data).get_data(), args.repeat)
+            size = len(provider.response(data).get_data())
+            print(f'{name:>22}: {elapsed:8.2f} ms  ({size / 1024:.0f} KiB)')
+
+
+if __name__ == '__main__':
+    main()
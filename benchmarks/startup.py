@@ -0,0 +1,70 @@
+"""Tempo de subida de um worker.
+
+Cada rodada sobe um processo Python novo (como um worker do gunicorn sem
+--preload) e mede: import do app (main.py), tempo do create_app(), primeira
+requisição sem banco e primeira requisição com consulta ao banco (abre a
+conexão e aplica os PRAGMAs). Com --preload o import acontece uma vez no
+processo master e os workers pagam só a primeira requisição.
+
+Uso:
+    python benchmarks/startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+client = main.app.test_client()
+t = time.perf_counter()
+client.get('/api/products/')
+no_db = time.perf_counter() - t
+t = time.perf_counter()
+client.post('/api/auth/login', json={'username': 'ninguem', 'password': 'x'})
+with_db = time.perf_counter() - t
+print(json.dumps({
+    'import': imported - started,
+    'create_app': main.app.config['STARTUP_SECONDS'],
+    'first_request': no_db,
+    'first_db_request': with_db,
+}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{os.path.join(tmp, "startup.db")}')
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'main', 'init-db'],
+            cwd=ROOT, env=env, check=True, capture_output=True
+        )
+
+        samples = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, '-c', PROBE],
+                cwd=ROOT, env=env, check=True, capture_output=True, text=True
+            ).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ('import', 'create_app', 'first_request', 'first_db_request'):
+        values = [sample[key] * 1000 for sample in samples]
+        print(f'{key:>17}: mediana {statistics.median(values):7.1f} ms  '
+              f'(min {min(values):.1f}, max {max(values):.1f})')
+
+
+if __name__ == '__main__':
+    main()
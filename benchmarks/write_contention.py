@@ -0,0 +1,139 @@
+"""Benchmark de contenção de escrita no SQLite.
+
+Vários processos (como workers do gunicorn) registram vendas ao mesmo tempo
+no mesmo arquivo de banco, enquanto outros leem a listagem de vendas.
+Compara o SQLite sem ajustes (SQLITE_TUNING=0) com o modo ajustado (WAL,
+busy_timeout, synchronous=NORMAL, ...) e mostra vendas/s, leituras/s e
+quantas requisições falharam com "database is locked".
+
+Uso:
+    python benchmarks/write_contention.py --writers 4 --readers 2 --sales 200
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_app(db_path, tuned):
+    os.environ['SQLITE_TUNING'] = '1' if tuned else '0'
+
+    from src.main import create_app
+
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'JWT_SECRET_KEY': 'benchmark-secret-key-with-enough-length',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    })
+
+
+def setup(db_path, tuned, products):
+    from src.models.database import db
+    from src.models.migrations import upgrade_database
+    from src.models.user import User
+    from src.models.category import Category
+    from src.models.product import Product
+
+    app = build_app(db_path, tuned)
+    with app.app_context():
+        upgrade_database()
+        user = User(username='caixa', role='admin')
+        user.set_password('caixa')
+        category = Category(name='Geral')
+        db.session.add_all([user, category])
+        db.session.flush()
+        db.session.add_all([
+            Product(name=f'Produto {i}', price_cents=1000, stock=10 ** 9, category_id=category.id)
+            for i in range(products)
+        ])
+        db.session.commit()
+
+
+def worker(role, db_path, tuned, requests, products, seed, ready, start, results):
+    app = build_app(db_path, tuned)
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'username': 'caixa', 'password': 'caixa'}).json['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    rng = random.Random(seed)
+
+    ready.release()
+    start.wait()
+    began = time.perf_counter()
+
+    ok = locked = failed = 0
+    for _ in range(requests):
+        if role == 'writer':
+            items = [
+                {'product_id': rng.randint(1, products), 'quantity': 1}
+                for _ in range(rng.randint(1, 5))
+            ]
+            response = client.post('/api/sales/', json={'items': items}, headers=headers)
+        else:
+            response = client.get('/api/sales/?per_page=50', headers=headers)
+        if response.status_code in (200, 201):
+            ok += 1
+        elif 'locked' in (response.get_json() or {}).get('error', ''):
+            locked += 1
+        else:
+            failed += 1
+    results.put((role, ok, locked, failed, time.perf_counter() - began))
+
+
+def run(tuned, writers, readers, requests, products):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        setup(db_path, tuned, products)
+
+        context = multiprocessing.get_context('spawn')
+        ready = context.Semaphore(0)
+        start = context.Event()
+        results = context.Queue()
+        roles = ['writer'] * writers + ['reader'] * readers
+        processes = [
+            context.Process(target=worker, args=(
+                role, db_path, tuned, requests, products, seed, ready, start, results
+            ))
+            for seed, role in enumerate(roles)
+        ]
+        for process in processes:
+            process.start()
+        # Mede só o período de carga, sem o tempo de subir os processos
+        for _ in processes:
+            ready.acquire()
+        start.set()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    elapsed = max(t[4] for t in totals)
+    label = 'ajustado (WAL)' if tuned else 'padrão'
+    for role, name in (('writer', 'vendas'), ('reader', 'leituras')):
+        rows = [t for t in totals if t[0] == role]
+        if not rows:
+            continue
+        ok = sum(t[1] for t in rows)
+        locked = sum(t[2] for t in rows)
+        failed = sum(t[3] for t in rows)
+        print(f'{label:>15} {name:>8}: {ok:5d} ok em {elapsed:.2f}s ({ok / elapsed:6.0f}/s), '
+              f'{locked} "database is locked", {failed} outros erros')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--sales', type=int, default=200, help='requisições por processo')
+    parser.add_argument('--products', type=int, default=50)
+    args = parser.parse_args()
+
+    for tuned in (False, True):
+        run(tuned, args.writers, args.readers, args.sales, args.products)
+
+
+if __name__ == '__main__':
+    main()
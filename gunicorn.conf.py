@@ -0,0 +1,16 @@
+from src.config import env_int
+from src.utils.passwords import DEFAULT_QUEUE, DEFAULT_WORKERS
+
+# Configuração do gunicorn (gunicorn -c gunicorn.conf.py main:app).
+# Workers com threads (gthread): logins ocupam no máximo
+# PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE threads por processo (ver
+# src/utils/passwords.py) e GUNICORN_FREE_THREADS ficam livres para as
+# demais rotas, mesmo durante uma rajada de logins.
+# O número de processos vem de WEB_CONCURRENCY (lido pelo próprio gunicorn).
+
+worker_class = 'gthread'
+threads = (
+    env_int('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+    + env_int('PASSWORD_HASH_QUEUE', DEFAULT_QUEUE)
+    + env_int('GUNICORN_FREE_THREADS', 4)
+)
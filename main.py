@@ -1,63 +1,12 @@
-import os
-from flask import Flask, send_from_directory
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from src.models.database import db
-from src.routes.auth import auth_bp
-from src.routes.users import users_bp
-from src.routes.categories import categories_bp
-from src.routes.products import products_bp
-from src.routes.sales import sales_bp
+from src.main import create_app
 
-app = Flask(__name__, static_folder=os.path.join('src', 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
-app.config['JWT_SECRET_KEY'] = 'jwt-secret-string'
-
-# Configuração do banco de dados SQLite
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///sistema_vendas.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# Inicializar extensões
-CORS(app, origins=["http://localhost:5173"], supports_credentials=True)
-jwt = JWTManager(app)
-db.init_app(app)
-
-# Registrar blueprints
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(users_bp, url_prefix='/api/users')
-app.register_blueprint(categories_bp, url_prefix='/api/categories')
-app.register_blueprint(products_bp, url_prefix='/api/products')
-app.register_blueprint(sales_bp, url_prefix='/api/sales')
-
-# Criar tabelas do banco de dados
-with app.app_context():
-    db.create_all()
-    
-    # Criar usuário admin padrão se não existir
-    from src.models.user import User
-    admin_user = User.query.filter_by(username='admin').first()
-    if not admin_user:
-        admin_user = User(username='admin', role='admin')
-        admin_user.set_password('admin123')
-        db.session.add(admin_user)
-        db.session.commit()
-        print("Usuário admin criado com sucesso! Username: admin, Password: admin123")
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+# Ponto de entrada do gunicorn (gunicorn main:app). O banco é preparado com
+# "flask --app main init-db" antes de subir os workers.
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
+    from src.commands import bootstrap_database
+    
+    with app.app_context():
+        bootstrap_database()
+    app.run(host='0.0.0.0', port=5001, debug=True)
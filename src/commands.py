@@ -0,0 +1,114 @@
+import click
+from flask.cli import with_appcontext
+
+# Comandos de linha de comando (flask <comando>)
+
+def bootstrap_database():
+    # Criar tabelas do banco de dados, aplicar migrações pendentes e
+    # criar o usuário admin padrão se não existir
+    from src.models.database import db
+    from src.models.migrations import upgrade_database
+    from src.models.user import User
+    
+    upgrade_database()
+    
+    admin_user = User.query.filter_by(username='admin').first()
+    if not admin_user:
+        admin_user = User(username='admin', role='admin')
+        admin_user.set_password('admin123')
+        db.session.add(admin_user)
+        db.session.commit()
+        print("Usuário admin criado com sucesso! Username: admin, Password: admin123")
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Cria/atualiza o esquema do banco e o usuário admin padrão."""
+    bootstrap_database()
+    click.echo("Banco de dados pronto")
+
+@click.command('backfill-daily-sales')
+@with_appcontext
+def backfill_daily_sales_command():
+    """Recalcula as tabelas daily_sales e daily_product_sales a partir das vendas."""
+    from src.models.database import db
+    from src.models.daily_sales import rebuild_daily_sales, DailySales
+    
+    with db.engine.begin() as connection:
+        rebuild_daily_sales(connection)
+    click.echo(f"Agregações diárias recalculadas: {DailySales.query.count()} dias")
+
+@click.command('compress-static')
+@with_appcontext
+def compress_static_command():
+    """Gera variantes .gz/.br dos arquivos de texto da pasta static."""
+    from flask import current_app
+    from src.utils.static_files import compress_static
+    
+    created = compress_static(current_app.static_folder)
+    click.echo(f"{len(created)} arquivos comprimidos gerados")
+
+@click.command('seed')
+@click.option('--seed', default=42, show_default=True, help='Semente do gerador (mesma semente, mesmos dados).')
+@click.option('--users', default=50, show_default=True)
+@click.option('--categories', default=20, show_default=True)
+@click.option('--products', default=2000, show_default=True)
+@click.option('--sales', default=100000, show_default=True)
+@click.option('--days', default=365, show_default=True, help='Período coberto pelas vendas.')
+@click.option('--start-date', default='2024-01-01', show_default=True, type=click.DateTime(['%Y-%m-%d']))
+@click.option('--batch-size', default=10000, show_default=True, help='Vendas por transação.')
+@with_appcontext
+def seed_command(seed, users, categories, products, sales, days, start_date, batch_size):
+    """Gera dados sintéticos (usuários, catálogo e vendas) para testes de escala."""
+    from src.seed import seed_database
+    import time
+    
+    bootstrap_database()
+    started = time.perf_counter()
+    seed_database(
+        seed=seed, users=users, categories=categories, products=products, sales=sales,
+        days=days, start_date=start_date, batch_size=batch_size, echo=click.echo
+    )
+    click.echo(f"Dados gerados em {time.perf_counter() - started:.1f}s")
+
+@click.command('compact-stock')
+@with_appcontext
+def compact_stock_command():
+    """Incorpora as movimentações de estoque pendentes ao snapshot dos produtos."""
+    from src.models.database import db
+    from src.models.stock import compact_stock
+    
+    compacted = compact_stock()
+    db.session.commit()
+    click.echo(f"Estoque compactado: {compacted} produtos atualizados")
+
+@click.command('reconcile-stock')
+@click.option('--fix', is_flag=True, help='Regrava o snapshot a partir do livro de movimentações.')
+@with_appcontext
+def reconcile_stock_command(fix):
+    """Confere o estoque dos produtos contra o livro de movimentações."""
+    from src.models.database import db
+    from src.models.catalog import bump_stock_version
+    from src.models.stock import reconcile_stock
+    
+    mismatches = reconcile_stock(fix=fix)
+    for product_id, name, snapshot, ledger in mismatches:
+        click.echo(f"Produto {product_id} ({name}): snapshot {snapshot}, livro {ledger}")
+    if fix:
+        if mismatches:
+            bump_stock_version()
+        db.session.commit()
+    if not mismatches:
+        click.echo("Estoque confere com o livro de movimentações")
+    elif fix:
+        click.echo(f"{len(mismatches)} produtos corrigidos")
+    else:
+        raise SystemExit(1)
+
+def register_commands(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(backfill_daily_sales_command)
+    app.cli.add_command(compress_static_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(compact_stock_command)
+    app.cli.add_command(reconcile_stock_command)
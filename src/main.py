@@ -3,67 +3,88 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+import time
+from importlib import import_module
+from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from src.models.database import db
-from src.routes.auth import auth_bp
-from src.routes.users import users_bp
-from src.routes.categories import categories_bp
-from src.routes.products import products_bp
-from src.routes.sales import sales_bp
+from src.config import app_config, database_config
+from src.models.database import init_database
+from src.commands import register_commands
+from src.utils.auth import register_token_checks
+from src.utils.json_provider import make_json_provider
+from src.utils.metrics import init_metrics
+from src.utils.query_debug import init_query_debug
+from src.utils.static_files import build_manifest, serve_static
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
-app.config['JWT_SECRET_KEY'] = 'jwt-secret-string'
+# Blueprints (módulo, atributo, prefixo); importados só quando o app é criado
+BLUEPRINTS = [
+    ('src.routes.auth', 'auth_bp', '/api/auth'),
+    ('src.routes.users', 'users_bp', '/api/users'),
+    ('src.routes.categories', 'categories_bp', '/api/categories'),
+    ('src.routes.products', 'products_bp', '/api/products'),
+    ('src.routes.sales', 'sales_bp', '/api/sales'),
+]
 
-# Configuração do banco de dados SQLite
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///sistema_vendas.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+def register_blueprints(app):
+    for module_name, attribute, url_prefix in BLUEPRINTS:
+        blueprint = getattr(import_module(module_name), attribute)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
 
-# Inicializar extensões
-CORS(app, origins=["http://localhost:5173"], supports_credentials=True)
-jwt = JWTManager(app)
-db.init_app(app)
-
-# Registrar blueprints
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(users_bp, url_prefix='/api/users')
-app.register_blueprint(categories_bp, url_prefix='/api/categories')
-app.register_blueprint(products_bp, url_prefix='/api/products')
-app.register_blueprint(sales_bp, url_prefix='/api/sales')
-
-# Criar tabelas do banco de dados
-with app.app_context():
-    db.create_all()
+def create_app(config=None):
+    # Nenhum acesso ao banco aqui: esquema e usuário admin ficam no comando
+    # "flask init-db", executado uma vez no deploy e não em cada worker.
+    started = time.perf_counter()
     
-    # Criar usuário admin padrão se não existir
-    from src.models.user import User
-    admin_user = User.query.filter_by(username='admin').first()
-    if not admin_user:
-        admin_user = User(username='admin', role='admin')
-        admin_user.set_password('admin123')
-        db.session.add(admin_user)
-        db.session.commit()
-        print("Usuário admin criado com sucesso! Username: admin, Password: admin123")
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    
+    # Configuração via variáveis de ambiente (banco, réplica, pool, PRAGMAs, chaves...)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.update(app_config())
+    app.config.update(database_config())
+    if config:
+        app.config.update(config)
+    
+    # JSON rápido (orjson, se instalado) com Decimal e datetime tratados no encoder
+    app.json = make_json_provider(app)
+    
+    # Inicializar extensões
+    CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
+    jwt = JWTManager(app)
+    register_token_checks(jwt)
+    init_database(app)
+    
+    # Latência, tempo de banco e comandos SQL por requisição (/metrics e Server-Timing)
+    init_metrics(app)
+    
+    # Log de consultas lentas e detector de N+1 (opcionais: SLOW_QUERY_MS, N_PLUS_ONE_THRESHOLD)
+    init_query_debug(app)
+    
+    register_blueprints(app)
+    
+    # Comandos de linha de comando (flask init-db, flask backfill-daily-sales, ...)
+    register_commands(app)
+    
+    # SPA: manifesto da pasta static montado uma vez (ETag, cache e .br/.gz)
+    static_manifest = build_manifest(app.static_folder, app.config.get('STATIC_IMMUTABLE_DIRS'))
+    app.extensions['static_manifest'] = static_manifest
+    
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        if app.static_folder is None:
             return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+        return serve_static(static_manifest, path)
+    
+    # Tempo de criação do app (ver benchmarks/startup.py)
+    app.config['STARTUP_SECONDS'] = time.perf_counter() - started
+    return app
 
 
 if __name__ == '__main__':
+    from src.commands import bootstrap_database
+    
+    app = create_app()
+    with app.app_context():
+        bootstrap_database()
     app.run(host='0.0.0.0', port=5001, debug=True)
-
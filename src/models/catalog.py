@@ -0,0 +1,70 @@
+import random
+from src.models.database import db
+from sqlalchemy import DDL, event
+
+# Versões usadas nos ETags das listagens; cada alteração incrementa um
+# contador na mesma transação e as listagens respondem 304 sem refazer as
+# consultas.
+#
+# catalog_version  produtos e categorias (cadastro, edição, exclusão): uma
+#                  linha só, alterada raramente e apenas por administradores.
+# stock_version    estoque (vendas, reposições, ajustes). Cada venda
+#                  incrementa uma linha sorteada entre STOCK_VERSION_SHARDS e
+#                  a versão é a soma: caixas diferentes quase nunca disputam
+#                  a mesma linha, e a soma cresce a cada commit, em qualquer
+#                  ordem de confirmação.
+
+STOCK_VERSION_SHARDS = 16
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class StockVersion(db.Model):
+    __tablename__ = 'stock_version'
+    
+    shard = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+event.listen(
+    CatalogVersion.__table__,
+    'after_create',
+    DDL('INSERT INTO catalog_version (id, version) VALUES (1, 0)')
+)
+
+event.listen(
+    StockVersion.__table__,
+    'after_create',
+    DDL('INSERT INTO stock_version (shard, version) VALUES ' + ', '.join(
+        f'({shard}, 0)' for shard in range(STOCK_VERSION_SHARDS)
+    ))
+)
+
+def bump_catalog_version():
+    db.session.execute(
+        db.update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def bump_stock_version():
+    db.session.execute(
+        db.update(StockVersion)
+        .where(StockVersion.shard == random.randrange(STOCK_VERSION_SHARDS))
+        .values(version=StockVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def current_catalog_version():
+    return db.session.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar() or 0
+
+def current_product_version():
+    # Listagens de produtos dependem do catálogo e do estoque (uma consulta)
+    catalog, stock = db.session.execute(db.select(
+        db.select(CatalogVersion.version).where(CatalogVersion.id == 1).scalar_subquery(),
+        db.select(db.func.coalesce(db.func.sum(StockVersion.version), 0)).scalar_subquery()
+    )).one()
+    return f'{catalog or 0}.{stock}'
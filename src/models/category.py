@@ -1,5 +1,6 @@
 from src.models.database import db
 from datetime import datetime
+from sqlalchemy.orm import load_only
 
 class Category(db.Model):
     __tablename__ = 'categories'
@@ -11,11 +12,36 @@ class Category(db.Model):
     # Relacionamento com produtos
     products = db.relationship('Product', backref='category', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'products_count': len(self.products)
+    def count_products(self):
+        # COUNT no banco em vez de carregar todos os produtos na memória
+        from src.models.product import Product
+        return db.session.query(db.func.count(Product.id)).filter(
+            Product.category_id == self.id
+        ).scalar()
+    
+    def has_products(self):
+        from src.models.product import Product
+        return db.session.query(
+            db.session.query(Product.id).filter(Product.category_id == self.id).exists()
+        ).scalar()
+    
+    FIELDS = ('id', 'name', 'created_at', 'products_count')
+    
+    @staticmethod
+    def load_options(fields=None):
+        # Carrega só as colunas dos campos pedidos (products_count vem do GROUP BY)
+        fields = fields or Category.FIELDS
+        return [load_only(*[
+            getattr(Category, field) for field in fields if field in Category.__mapper__.column_attrs
+        ])]
+    
+    def to_dict(self, products_count=None, fields=None):
+        fields = fields or self.FIELDS
+        data = {
+            field: getattr(self, field)
+            for field in fields if field != 'products_count'
         }
+        if 'products_count' in fields:
+            data['products_count'] = self.count_products() if products_count is None else products_count
+        return data
 
@@ -0,0 +1,107 @@
+from src.models.database import db
+from sqlalchemy.dialects import mysql, sqlite
+
+# Tabelas de agregação diária, mantidas pelo create_sale na mesma transação.
+# Os relatórios leem poucas linhas daqui em vez de varrer o histórico de vendas.
+
+class DailySales(db.Model):
+    __tablename__ = 'daily_sales'
+    
+    day = db.Column(db.Date, primary_key=True)
+    total_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    sales_count = db.Column(db.Integer, nullable=False, default=0)
+
+class DailyProductSales(db.Model):
+    __tablename__ = 'daily_product_sales'
+    
+    day = db.Column(db.Date, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    total_cents = db.Column(db.BigInteger, nullable=False, default=0)
+
+def _increment(model, keys, counters, rows):
+    # INSERT ... ON CONFLICT/ON DUPLICATE KEY somando os contadores
+    table = model.__table__
+    dialect = db.session.get_bind().dialect.name
+    
+    if dialect == 'sqlite':
+        stmt = sqlite.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: table.c[name] + stmt.excluded[name] for name in counters}
+        )
+        db.session.execute(stmt, rows)
+    elif dialect in ('mysql', 'mariadb'):
+        stmt = mysql.insert(table)
+        stmt = stmt.on_duplicate_key_update(
+            {name: table.c[name] + stmt.inserted[name] for name in counters}
+        )
+        db.session.execute(stmt, rows)
+    else:
+        for row in rows:
+            where = [table.c[key] == row[key] for key in keys]
+            result = db.session.execute(
+                table.update().where(*where).values(
+                    {name: table.c[name] + row[name] for name in counters}
+                )
+            )
+            if result.rowcount == 0:
+                db.session.execute(table.insert().values(row))
+
+def record_sale(timestamp, total_cents, items):
+    # items: lista de (product_id, quantity, subtotal_cents)
+    record_sales([(timestamp, total_cents, items)])
+
+def record_sales(sales):
+    # Agrega várias vendas por dia/produto antes de gravar (usado na importação em lote)
+    per_day = {}
+    per_product = {}
+    for timestamp, total_cents, items in sales:
+        day = timestamp.date()
+        current = per_day.setdefault(day, [0, 0])
+        current[0] += total_cents
+        current[1] += 1
+        for product_id, quantity, subtotal in items:
+            current = per_product.setdefault((day, product_id), [0, 0])
+            current[0] += quantity
+            current[1] += subtotal
+    
+    if not per_day:
+        return
+    
+    _increment(DailySales, ['day'], ['total_cents', 'sales_count'], [
+        {'day': day, 'total_cents': amount, 'sales_count': count}
+        for day, (amount, count) in per_day.items()
+    ])
+    _increment(DailyProductSales, ['day', 'product_id'], ['quantity', 'total_cents'], [
+        {'day': day, 'product_id': product_id, 'quantity': quantity, 'total_cents': amount}
+        for (day, product_id), (quantity, amount) in per_product.items()
+    ])
+
+def rebuild_daily_sales(connection):
+    # Recalcula as agregações a partir do histórico (backfill)
+    from src.models.sale import Sale, SaleItem
+    
+    day = db.func.date(Sale.timestamp)
+    
+    connection.execute(db.delete(DailyProductSales))
+    connection.execute(db.delete(DailySales))
+    
+    connection.execute(db.insert(DailySales).from_select(
+        ['day', 'total_cents', 'sales_count'],
+        db.select(day, db.func.sum(Sale.total_cents), db.func.count(Sale.id))
+        .where(Sale.timestamp.isnot(None))
+        .group_by(day)
+    ))
+    connection.execute(db.insert(DailyProductSales).from_select(
+        ['day', 'product_id', 'quantity', 'total_cents'],
+        db.select(
+            day,
+            SaleItem.product_id,
+            db.func.sum(SaleItem.quantity),
+            db.func.sum(SaleItem.quantity * SaleItem.price_at_sale_cents)
+        )
+        .join(Sale, Sale.id == SaleItem.sale_id)
+        .where(Sale.timestamp.isnot(None))
+        .group_by(day, SaleItem.product_id)
+    ))
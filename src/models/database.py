@@ -1,4 +1,50 @@
+from functools import wraps
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
 
-db = SQLAlchemy()
+class RoutingSession(Session):
+    # Em rotas marcadas com @use_read_replica, SELECTs vão para a réplica
+    # (bind 'replica'); escritas e flushes continuam no banco principal.
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_request_context()
+            and g.get('use_read_replica')
+            and (clause is None or isinstance(clause, Select))
+        ):
+            engine = self._db.engines.get('replica')
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
 
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def use_read_replica(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        g.use_read_replica = True
+        return fn(*args, **kwargs)
+    return wrapper
+
+def init_database(app):
+    db.init_app(app)
+    
+    # PRAGMAs do SQLite (WAL, busy_timeout, ...) em cada conexão nova do pool
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if pragmas:
+        with app.app_context():
+            for engine in db.engines.values():
+                if engine.dialect.name == 'sqlite':
+                    event.listen(engine, 'connect', _sqlite_connect_hook(pragmas))
+
+def _sqlite_connect_hook(pragmas):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    return set_pragmas
@@ -0,0 +1,137 @@
+from src.models.database import db
+from datetime import datetime
+
+# Migrações simples e versionadas. db.create_all() só cria tabelas novas;
+# alterações em tabelas existentes (índices, colunas, dados) entram aqui.
+
+MIGRATIONS = []
+
+def migration(version):
+    def decorator(func):
+        MIGRATIONS.append((version, func))
+        return func
+    return decorator
+
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+    
+    version = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def _create_indexes(connection, *names):
+    indexes = {
+        index.name: index
+        for table in db.metadata.sorted_tables
+        for index in table.indexes
+    }
+    for name in names:
+        indexes[name].create(connection, checkfirst=True)
+
+@migration(1)
+def add_hot_path_indexes(connection):
+    _create_indexes(
+        connection,
+        'ix_sales_timestamp',
+        'ix_sales_user_id_timestamp',
+        'ix_sale_items_sale_id',
+        'ix_sale_items_product_id',
+        'ix_products_category_id',
+        'ix_products_name',
+    )
+
+@migration(2)
+def backfill_daily_sales(connection):
+    from src.models.daily_sales import rebuild_daily_sales
+    # Banco ainda com valores em reais: a migração 5 converte e recalcula
+    columns = {column['name'] for column in db.inspect(connection).get_columns('sales')}
+    if 'total_cents' not in columns:
+        return
+    rebuild_daily_sales(connection)
+
+@migration(3)
+def create_product_search_index(connection):
+    from src.models.product_search import create_search_index
+    create_search_index(connection)
+
+@migration(4)
+def add_user_token_version(connection):
+    columns = {column['name'] for column in db.inspect(connection).get_columns('users')}
+    if 'token_version' not in columns:
+        connection.exec_driver_sql(
+            'ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0'
+        )
+
+# (tabela, coluna em reais, coluna em centavos)
+MONEY_COLUMNS = [
+    ('products', 'price', 'price_cents'),
+    ('sales', 'total_amount', 'total_cents'),
+    ('sale_items', 'price_at_sale', 'price_at_sale_cents'),
+    ('daily_sales', 'total_amount', 'total_cents'),
+    ('daily_product_sales', 'total_amount', 'total_cents'),
+]
+
+@migration(5)
+def convert_money_to_cents(connection):
+    from src.models.daily_sales import rebuild_daily_sales
+    # Numeric(10,2) -> centavos inteiros (requer SQLite 3.35+ para DROP COLUMN)
+    inspector = db.inspect(connection)
+    integer = 'INTEGER' if connection.dialect.name == 'sqlite' else 'SIGNED'
+    for table, old, new in MONEY_COLUMNS:
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if old not in columns:
+            continue
+        if new not in columns:
+            connection.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {new} BIGINT NOT NULL DEFAULT 0')
+        connection.exec_driver_sql(f'UPDATE {table} SET {new} = CAST(ROUND({old} * 100) AS {integer})')
+        connection.exec_driver_sql(f'ALTER TABLE {table} DROP COLUMN {old}')
+    # Agregações recalculadas a partir dos centavos
+    rebuild_daily_sales(connection)
+
+@migration(6)
+def create_stock_ledger(connection):
+    # O estoque atual de cada produto vira a movimentação inicial do livro,
+    # já incorporada ao snapshot (stock_movement_id aponta para ela)
+    columns = {column['name'] for column in db.inspect(connection).get_columns('products')}
+    if 'stock_movement_id' not in columns:
+        connection.exec_driver_sql(
+            'ALTER TABLE products ADD COLUMN stock_movement_id INTEGER NOT NULL DEFAULT 0'
+        )
+    connection.execute(db.text(
+        "INSERT INTO stock_movements (product_id, delta, reason, created_at) "
+        "SELECT id, stock, 'initial', :now FROM products WHERE stock <> 0"
+    ), {'now': datetime.utcnow()})
+    connection.exec_driver_sql(
+        'UPDATE products SET stock_movement_id = COALESCE('
+        '(SELECT MAX(id) FROM stock_movements WHERE stock_movements.product_id = products.id), 0)'
+    )
+
+@migration(7)
+def add_sale_client_id(connection):
+    columns = {column['name'] for column in db.inspect(connection).get_columns('sales')}
+    if 'client_id' not in columns:
+        connection.exec_driver_sql('ALTER TABLE sales ADD COLUMN client_id VARCHAR(64)')
+    _create_indexes(connection, 'ux_sales_user_id_client_id')
+
+def upgrade_database():
+    # Importa os modelos para que create_all conheça todas as tabelas
+    import src.models.user, src.models.category, src.models.product, src.models.sale  # noqa: F401
+    import src.models.daily_sales, src.models.product_search, src.models.catalog, src.models.stock  # noqa: F401
+    
+    # Banco novo: create_all já cria o esquema atual, basta registrar as migrações
+    fresh = not db.inspect(db.engine).has_table('sales')
+    db.create_all()
+    
+    with db.engine.begin() as connection:
+        applied = set(connection.execute(db.select(SchemaMigration.version)).scalars())
+        for version, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if version in applied:
+                continue
+            if not fresh:
+                func(connection)
+                print(f"Migração {version} ({func.__name__}) aplicada")
+            connection.execute(db.insert(SchemaMigration).values(
+                version=version,
+                name=func.__name__,
+                applied_at=datetime.utcnow()
+            ))
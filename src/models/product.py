@@ -1,29 +1,61 @@
 from src.models.database import db
+from src.models.category import Category
+from src.models.stock import StockMovement
+from src.utils.money import from_cents
 from datetime import datetime
+from sqlalchemy.orm import column_property, configure_mappers, joinedload, load_only
 
 class Product(db.Model):
     __tablename__ = 'products'
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False)
+    name = db.Column(db.String(200), nullable=False, index=True)
     description = db.Column(db.Text)
-    price = db.Column(db.Numeric(10, 2), nullable=False)
+    price_cents = db.Column(db.Integer, nullable=False)  # preço em centavos
+    # Snapshot do estoque: soma das movimentações até stock_movement_id (ver src/models/stock.py)
     stock = db.Column(db.Integer, nullable=False, default=0)
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
+    stock_movement_id = db.Column(db.Integer, nullable=False, default=0)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Estoque atual: snapshot + movimentações pendentes, no mesmo SELECT
+    current_stock = column_property(
+        stock + db.select(db.func.coalesce(db.func.sum(StockMovement.delta), 0)).where(
+            StockMovement.product_id == id,
+            StockMovement.id > stock_movement_id
+        ).scalar_subquery()
+    )
+    
     # Relacionamento com itens de venda
     sale_items = db.relationship('SaleItem', backref='product', lazy=True)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'price': float(self.price),
-            'stock': self.stock,
-            'category_id': self.category_id,
-            'category_name': self.category.name if self.category else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+    FIELDS = ('id', 'name', 'description', 'price', 'stock', 'category_id', 'category_name', 'created_at')
+    FIELD_COLUMNS = {'price': 'price_cents', 'stock': 'current_stock'}
+    
+    @staticmethod
+    def load_options(fields=None):
+        # Carrega só as colunas dos campos pedidos; a categoria vem no mesmo
+        # SELECT (JOIN) apenas quando category_name é pedido
+        configure_mappers()  # garante que o backref Product.category exista
+        fields = fields or Product.FIELDS
+        names = [Product.FIELD_COLUMNS.get(field, field) for field in fields]
+        columns = [getattr(Product, name) for name in names if name in Product.__mapper__.column_attrs]
+        options = []
+        if 'category_name' in fields:
+            columns.append(Product.category_id)
+            options.append(joinedload(Product.category).load_only(Category.name))
+        return [load_only(*columns)] + options
+    
+    def to_dict(self, fields=None):
+        return {field: PRODUCT_FIELDS[field](self) for field in fields or self.FIELDS}
 
+PRODUCT_FIELDS = {
+    'id': lambda product: product.id,
+    'name': lambda product: product.name,
+    'description': lambda product: product.description,
+    'price': lambda product: from_cents(product.price_cents),
+    'stock': lambda product: product.current_stock,
+    'category_id': lambda product: product.category_id,
+    'category_name': lambda product: product.category.name if product.category else None,
+    'created_at': lambda product: product.created_at,
+}
@@ -0,0 +1,68 @@
+import re
+from sqlalchemy import DDL, column, event, table
+from src.models.database import db
+from src.models.product import Product
+
+# Índice de busca textual (SQLite FTS5) sobre nome e descrição dos produtos.
+# É uma tabela "external content": guarda só o índice, o conteúdo continua em
+# products. Triggers mantêm o índice em dia em inserts, deletes e mudanças de
+# nome/descrição (baixas de estoque não tocam no índice).
+
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+products_fts = table('products_fts', column('rowid'), column('rank'), column('products_fts'))
+
+for statement in FTS_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+def create_search_index(connection):
+    # Cria o índice em bancos existentes e indexa os produtos já cadastrados
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+_available = {}
+
+def search_index_available():
+    engine = db.engine
+    if engine.url not in _available:
+        _available[engine.url] = (
+            engine.dialect.name == 'sqlite' and db.inspect(engine).has_table('products_fts')
+        )
+    return _available[engine.url]
+
+def match_expression(search):
+    # "caf ban" -> "caf"* "ban"* (todos os termos, com prefixo)
+    terms = re.findall(r'\w+', search)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_products(query, search, ranked=True):
+    expression = match_expression(search)
+    if not expression or not search_index_available():
+        # Fallback para outros bancos (MySQL etc.)
+        return query.filter(Product.name.contains(search))
+    
+    query = query.join(products_fts, products_fts.c.rowid == Product.id).filter(
+        products_fts.c.products_fts.op('MATCH')(expression)
+    )
+    if ranked:
+        query = query.order_by(products_fts.c.rank)
+    return query
@@ -1,35 +1,63 @@
 from src.models.database import db
 from datetime import datetime
+from src.models.product import Product
+from src.models.user import User
+from src.utils.money import from_cents
+from sqlalchemy.orm import configure_mappers, joinedload, load_only, selectinload
 
 class Sale(db.Model):
     __tablename__ = 'sales'
+    # (user_id, timestamp) atende a listagem de não-admins e também buscas só por user_id
+    __table_args__ = (
+        db.Index('ix_sales_user_id_timestamp', 'user_id', 'timestamp'),
+        # Vendas offline importadas em lote: o PDV pode reenviar sem duplicar
+        db.Index('ux_sales_user_id_client_id', 'user_id', 'client_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    total_amount = db.Column(db.Numeric(10, 2), nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    total_cents = db.Column(db.Integer, nullable=False)  # total em centavos
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    client_id = db.Column(db.String(64))  # id gerado pelo PDV offline (POST /api/sales/batch)
     
     # Relacionamento com itens de venda
     items = db.relationship('SaleItem', backref='sale', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'user_username': self.user.username if self.user else None,
-            'total_amount': float(self.total_amount),
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
-            'items': [item.to_dict() for item in self.items]
-        }
+    FIELDS = ('id', 'user_id', 'user_username', 'total_amount', 'timestamp')
+    FIELD_COLUMNS = {'total_amount': 'total_cents'}
+    
+    @staticmethod
+    def eager_options(fields=None, include_items=True):
+        # Carrega usuário, itens e produtos em lote (evita N+1 no to_dict),
+        # só com as colunas e relacionamentos que a resposta vai usar
+        configure_mappers()  # garante que os backrefs (Sale.user, SaleItem.product) existam
+        fields = fields or Sale.FIELDS
+        columns = [Sale.timestamp]  # usado também pelo cursor da paginação
+        names = [Sale.FIELD_COLUMNS.get(field, field) for field in fields]
+        columns += [getattr(Sale, name) for name in names if name in Sale.__table__.columns]
+        if 'user_username' in fields:
+            columns.append(Sale.user_id)
+        options = [load_only(*columns)]
+        if 'user_username' in fields:
+            options.append(joinedload(Sale.user).load_only(User.username))
+        if include_items:
+            options.append(selectinload(Sale.items).joinedload(SaleItem.product).load_only(Product.name))
+        return options
+    
+    def to_dict(self, fields=None, include_items=True):
+        data = {field: SALE_FIELDS[field](self) for field in fields or self.FIELDS}
+        if include_items:
+            data['items'] = [item.to_dict() for item in self.items]
+        return data
 
 class SaleItem(db.Model):
     __tablename__ = 'sale_items'
     
     id = db.Column(db.Integer, primary_key=True)
-    sale_id = db.Column(db.Integer, db.ForeignKey('sales.id'), nullable=False)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    sale_id = db.Column(db.Integer, db.ForeignKey('sales.id'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
     quantity = db.Column(db.Integer, nullable=False)
-    price_at_sale = db.Column(db.Numeric(10, 2), nullable=False)
+    price_at_sale_cents = db.Column(db.Integer, nullable=False)  # preço unitário em centavos
     
     def to_dict(self):
         return {
@@ -38,7 +66,14 @@ class SaleItem(db.Model):
             'product_id': self.product_id,
             'product_name': self.product.name if self.product else None,
             'quantity': self.quantity,
-            'price_at_sale': float(self.price_at_sale),
-            'subtotal': float(self.quantity * self.price_at_sale)
+            'price_at_sale': from_cents(self.price_at_sale_cents),
+            'subtotal': from_cents(self.quantity * self.price_at_sale_cents)
         }
 
+SALE_FIELDS = {
+    'id': lambda sale: sale.id,
+    'user_id': lambda sale: sale.user_id,
+    'user_username': lambda sale: sale.user.username if sale.user else None,
+    'total_amount': lambda sale: from_cents(sale.total_cents),
+    'timestamp': lambda sale: sale.timestamp,
+}
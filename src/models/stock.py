@@ -0,0 +1,195 @@
+from src.models.database import db
+from datetime import datetime
+from flask import current_app
+
+# Livro de movimentações de estoque (somente inserção): vendas, reposições e
+# ajustes manuais viram linhas aqui em vez de UPDATEs na linha do produto.
+#
+# Estoque atual = products.stock (snapshot, com as movimentações até
+# products.stock_movement_id) + soma das movimentações pendentes depois dele.
+# A compactação incorpora as pendentes ao snapshot, então a leitura percorre
+# poucas linhas do índice (product_id, id).
+#
+# Concorrência: a conferência de estoque é estrita (nunca vende além do
+# disponível), então as vendas de um MESMO produto continuam em fila, uma de
+# cada vez, como no UPDATE condicional que o livro substituiu. No SQLite a
+# fila é a trava de escrita do banco; nos demais (MySQL/InnoDB) é a trava da
+# linha do produto (lock_products). O livro não reduz essa espera por produto:
+# o ganho é não reescrever a linha do produto a cada venda e ter o histórico.
+# Vendas de produtos diferentes não disputam travas entre si.
+
+class StockMovement(db.Model):
+    __tablename__ = 'stock_movements'
+    __table_args__ = (
+        db.Index('ix_stock_movements_product_id_id', 'product_id', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    delta = db.Column(db.Integer, nullable=False)
+    reason = db.Column(db.String(20), nullable=False)  # initial, sale, restock ou adjustment
+    sale_id = db.Column(db.Integer, db.ForeignKey('sales.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'product_id': self.product_id,
+            'delta': self.delta,
+            'reason': self.reason,
+            'sale_id': self.sale_id,
+            'user_id': self.user_id,
+            'created_at': self.created_at
+        }
+
+def _pending(*conditions):
+    from src.models.product import Product
+    return db.and_(
+        StockMovement.product_id == Product.id,
+        StockMovement.id > Product.stock_movement_id,
+        *conditions
+    )
+
+def lock_products(product_ids):
+    # Trava as linhas dos produtos (SELECT ... FOR UPDATE, em ordem de id para
+    # não haver deadlock) antes de gravar no livro. No SQLite, que já
+    # serializa as escritas, não há o que travar e nenhuma consulta é feita.
+    from src.models.product import Product
+    
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return
+    db.session.execute(
+        db.select(Product.id)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+
+def _stock_after(product_ids):
+    # Estoque atual e quantidade de movimentações pendentes por produto,
+    # já contando as gravadas nesta transação. Leitura com trava (LOCK IN
+    # SHARE MODE no MySQL) e por JOIN, não por subconsulta: enxerga o que já
+    # foi confirmado, e não o snapshot do início da transação (REPEATABLE READ).
+    from src.models.product import Product
+    
+    state = {}
+    rows = db.session.execute(
+        db.select(Product.id, Product.stock, StockMovement.delta)
+        .outerjoin(StockMovement, _pending())
+        .where(Product.id.in_(product_ids))
+        .with_for_update(read=True)
+    )
+    for product_id, stock, delta in rows:
+        current, count = state.get(product_id, (stock, 0))
+        if delta is not None:
+            current, count = current + delta, count + 1
+        state[product_id] = (current, count)
+    return state
+
+def record_movements(movements):
+    # Grava as movimentações (executemany) e confere, na mesma transação, se
+    # algum produto ficou com estoque negativo. No SQLite, 2 comandos; nos
+    # demais, mais o SELECT ... FOR UPDATE dos produtos.
+    # movements: dicts com product_id, delta, reason e opcionalmente sale_id/user_id.
+    # Retorna o id do primeiro produto sem estoque (o chamador desfaz a
+    # transação), ou None.
+    if not movements:
+        return None
+    
+    deltas = {}
+    for movement in movements:
+        deltas[movement['product_id']] = deltas.get(movement['product_id'], 0) + movement['delta']
+    product_ids = sorted(deltas)
+    
+    lock_products(product_ids)
+    now = datetime.utcnow()
+    db.session.execute(db.insert(StockMovement), [
+        {'sale_id': None, 'user_id': None, **movement, 'created_at': now}
+        for movement in movements
+    ])
+    
+    state = _stock_after(product_ids)
+    for product_id in product_ids:
+        if deltas[product_id] < 0 and state.get(product_id, (0, 0))[0] < 0:
+            return product_id
+    
+    # Compacta aos poucos os produtos com muitas movimentações pendentes
+    threshold = current_app.config.get('STOCK_COMPACT_THRESHOLD', 100)
+    crowded = [product_id for product_id in product_ids if state.get(product_id, (0, 0))[1] >= threshold]
+    if crowded:
+        compact_stock(crowded)
+    return None
+
+def set_stock(product_id, stock, user_id=None):
+    # Ajuste manual para um valor absoluto: com o produto travado, a diferença
+    # é calculada no próprio INSERT ... SELECT
+    from src.models.product import Product
+    
+    lock_products([product_id])
+    db.session.execute(db.insert(StockMovement).from_select(
+        ['product_id', 'delta', 'reason', 'user_id', 'created_at'],
+        db.select(
+            Product.id,
+            stock - Product.current_stock,
+            db.literal('adjustment'),
+            db.literal(user_id, db.Integer),
+            db.literal(datetime.utcnow(), db.DateTime)
+        ).where(Product.id == product_id)
+    ))
+
+def compact_stock(product_ids=None):
+    # Incorpora as movimentações pendentes ao snapshot (products.stock).
+    # O novo stock_movement_id é o maior id do próprio produto, lido com o
+    # produto travado: nenhuma movimentação dele pode estar em uma transação
+    # ainda aberta (um id global, como max(id), pularia ids já reservados
+    # por transações não confirmadas, que nunca mais seriam somados).
+    from src.models.product import Product
+    
+    candidates = db.select(Product.id).where(db.exists().where(_pending()))
+    if product_ids is not None:
+        candidates = candidates.where(Product.id.in_(product_ids))
+    product_ids = db.session.execute(
+        candidates.order_by(Product.id).with_for_update()
+    ).scalars().all()
+    if not product_ids:
+        return 0
+    
+    pending_total = db.select(db.func.coalesce(db.func.sum(StockMovement.delta), 0)).where(
+        _pending()
+    ).scalar_subquery()
+    last_id = db.select(db.func.max(StockMovement.id)).where(
+        _pending()
+    ).scalar_subquery()
+    
+    stmt = db.update(Product).where(Product.id.in_(product_ids)).ordered_values(
+        # stock antes de stock_movement_id: o MySQL aplica o SET na ordem
+        (Product.stock, Product.stock + pending_total),
+        (Product.stock_movement_id, last_id),
+    ).execution_options(synchronize_session=False)
+    return db.session.execute(stmt).rowcount
+
+def reconcile_stock(fix=False):
+    # Confere o snapshot contra a soma do livro até stock_movement_id.
+    # Retorna [(id, nome, snapshot, soma do livro)] dos produtos divergentes.
+    from src.models.product import Product
+    
+    ledger_total = db.select(db.func.coalesce(db.func.sum(StockMovement.delta), 0)).where(
+        StockMovement.product_id == Product.id,
+        StockMovement.id <= Product.stock_movement_id
+    ).scalar_subquery()
+    
+    mismatches = db.session.execute(
+        db.select(Product.id, Product.name, Product.stock, ledger_total)
+        .where(Product.stock != ledger_total)
+        .order_by(Product.id)
+    ).all()
+    
+    if fix and mismatches:
+        db.session.execute(
+            db.update(Product)
+            .where(Product.stock != ledger_total)
+            .values(stock=ledger_total)
+            .execution_options(synchronize_session=False)
+        )
+    return mismatches
@@ -1,5 +1,5 @@
 from src.models.database import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.utils.passwords import hash_password, needs_rehash, verify_password
 from datetime import datetime
 
 class User(db.Model):
@@ -7,24 +7,29 @@ class User(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
-    password_hash = db.Column(db.String(120), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='funcionario')  # admin ou funcionario
+    token_version = db.Column(db.Integer, nullable=False, default=0)  # incrementado para revogar tokens
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relacionamento com vendas
     sales = db.relationship('Sale', backref='user', lazy=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        # Parâmetros de hash mudaram desde que a senha foi gravada
+        return needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
             'id': self.id,
             'username': self.username,
             'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
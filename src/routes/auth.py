@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required
 from src.models.database import db
 from src.models.user import User
+from src.utils.auth import get_current_user_id, token_claims
+from src.utils.passwords import PasswordHashBusy
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -18,7 +20,13 @@ def login():
         user = User.query.filter_by(username=username).first()
         
         if user and user.check_password(password):
-            access_token = create_access_token(identity=user.id)
+            # Regrava o hash com os parâmetros atuais, aproveitando a senha em claro
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
+            
+            # role e versão do token vão como claims: as rotas autorizam sem consultar o banco
+            access_token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
             return jsonify({
                 'access_token': access_token,
                 'user': user.to_dict()
@@ -26,6 +34,9 @@ def login():
         else:
             return jsonify({'error': 'Credenciais inválidas'}), 401
             
+    except PasswordHashBusy:
+        return jsonify({'error': 'Muitos logins simultâneos. Tente novamente em instantes.'}), 503, {'Retry-After': '1'}
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -33,7 +44,7 @@ def login():
 @jwt_required()
 def get_current_user():
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         user = User.query.get(current_user_id)
         
         if user:
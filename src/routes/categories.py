@@ -1,33 +1,44 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from src.models.database import db
-from src.models.user import User
 from src.models.category import Category
+from src.models.product import Product
+from src.models.catalog import bump_catalog_version
+from src.utils.auth import admin_required
+from src.utils.fields import requested_fields
+from src.utils.http_cache import catalog_etag
 
 categories_bp = Blueprint('categories', __name__)
 
-def require_admin():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user and user.role == 'admin'
-
 @categories_bp.route('/', methods=['GET'])
 @jwt_required()
+@catalog_etag
 def get_categories():
     try:
-        categories = Category.query.all()
-        return jsonify([category.to_dict() for category in categories]), 200
+        try:
+            fields = requested_fields(Category.FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Sem products_count não há por que juntar com produtos
+        if fields is not None and 'products_count' not in fields:
+            categories = Category.query.options(*Category.load_options(fields)).all()
+            return jsonify([category.to_dict(fields=fields) for category in categories]), 200
+        
+        # Uma única consulta com GROUP BY para a contagem de produtos
+        rows = db.session.query(
+            Category,
+            db.func.count(Product.id)
+        ).options(*Category.load_options(fields)).outerjoin(Product, Product.category_id == Category.id).group_by(Category.id).all()
+        return jsonify([category.to_dict(products_count=count, fields=fields) for category, count in rows]), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @categories_bp.route('/', methods=['POST'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem criar categorias.')
 def create_category():
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem criar categorias.'}), 403
-        
         data = request.get_json()
         name = data.get('name')
         
@@ -41,6 +52,7 @@ def create_category():
         
         category = Category(name=name)
         db.session.add(category)
+        bump_catalog_version()
         db.session.commit()
         
         return jsonify(category.to_dict()), 201
@@ -50,12 +62,9 @@ def create_category():
         return jsonify({'error': str(e)}), 500
 
 @categories_bp.route('/<int:category_id>', methods=['PUT'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem editar categorias.')
 def update_category(category_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem editar categorias.'}), 403
-        
         category = Category.query.get(category_id)
         if not category:
             return jsonify({'error': 'Categoria não encontrada'}), 404
@@ -72,6 +81,7 @@ def update_category(category_id):
             return jsonify({'error': 'Nome da categoria já existe'}), 400
         
         category.name = name
+        bump_catalog_version()
         db.session.commit()
         
         return jsonify(category.to_dict()), 200
@@ -81,21 +91,19 @@ def update_category(category_id):
         return jsonify({'error': str(e)}), 500
 
 @categories_bp.route('/<int:category_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem deletar categorias.')
 def delete_category(category_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem deletar categorias.'}), 403
-        
         category = Category.query.get(category_id)
         if not category:
             return jsonify({'error': 'Categoria não encontrada'}), 404
         
         # Verificar se há produtos associados à categoria
-        if category.products:
+        if category.has_products():
             return jsonify({'error': 'Não é possível deletar categoria com produtos associados'}), 400
         
         db.session.delete(category)
+        bump_catalog_version()
         db.session.commit()
         
         return jsonify({'message': 'Categoria deletada com sucesso'}), 200
@@ -1,34 +1,67 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.database import db
-from src.models.user import User
+from flask_jwt_extended import jwt_required
+from src.models.database import db, use_read_replica
 from src.models.product import Product
 from src.models.category import Category
+from src.models.sale import SaleItem
+from src.models.catalog import bump_catalog_version, bump_stock_version
+from src.models.stock import StockMovement, record_movements, set_stock
+from src.models.product_search import search_products
+from src.utils.auth import admin_required, get_current_user_id
+from src.utils.fields import requested_fields
+from src.utils.http_cache import product_etag
+from src.utils.money import to_cents
+from src.utils.pagination import decode_cursor, fetch_page, requested_per_page, wants_cursor, wants_total
 
 products_bp = Blueprint('products', __name__)
 
-def require_admin():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user and user.role == 'admin'
-
 @products_bp.route('/', methods=['GET'])
 @jwt_required()
+@use_read_replica
+@product_etag
 def get_products():
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
+        per_page = requested_per_page(50)
         search = request.args.get('search', '')
         category_id = request.args.get('category_id', type=int)
         
-        query = Product.query
+        try:
+            fields = requested_fields(Product.FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = Product.query.options(*Product.load_options(fields))
         
         if search:
-            query = query.filter(Product.name.contains(search))
+            # Busca no índice FTS (com prefixo e ordenada por relevância); na
+            # paginação por cursor a ordem precisa ser por id
+            query = search_products(query, search, ranked=not wants_cursor())
         
         if category_id:
             query = query.filter(Product.category_id == category_id)
         
+        # Paginação por cursor (opcional): busca por id sem OFFSET
+        if wants_cursor():
+            page_query = query.order_by(Product.id)
+            cursor = request.args.get('cursor')
+            if cursor:
+                try:
+                    cursor_id, = decode_cursor(cursor)
+                    cursor_id = int(cursor_id)
+                except (ValueError, TypeError):
+                    return jsonify({'error': 'Cursor inválido'}), 400
+                page_query = page_query.filter(Product.id > cursor_id)
+            
+            products, next_cursor = fetch_page(page_query, per_page, lambda product: [product.id])
+            response = {
+                'products': [product.to_dict(fields) for product in products],
+                'next_cursor': next_cursor
+            }
+            if wants_total():
+                response['total'] = query.count()
+            return jsonify(response), 200
+        
         products = query.paginate(
             page=page, 
             per_page=per_page, 
@@ -36,7 +69,7 @@ def get_products():
         )
         
         return jsonify({
-            'products': [product.to_dict() for product in products.items],
+            'products': [product.to_dict(fields) for product in products.items],
             'total': products.total,
             'pages': products.pages,
             'current_page': page
@@ -46,12 +79,9 @@ def get_products():
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/', methods=['POST'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem criar produtos.')
 def create_product():
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem criar produtos.'}), 403
-        
         data = request.get_json()
         name = data.get('name')
         description = data.get('description', '')
@@ -68,7 +98,7 @@ def create_product():
             return jsonify({'error': 'Categoria não encontrada'}), 404
         
         try:
-            price = float(price)
+            price = to_cents(price)
             stock = int(stock)
         except ValueError:
             return jsonify({'error': 'Preço deve ser um número e estoque deve ser um inteiro'}), 400
@@ -79,12 +109,19 @@ def create_product():
         product = Product(
             name=name,
             description=description,
-            price=price,
-            stock=stock,
+            price_cents=price,
             category_id=category_id
         )
         
         db.session.add(product)
+        db.session.flush()
+        
+        # Estoque inicial entra no livro de movimentações
+        if stock:
+            record_movements([
+                {'product_id': product.id, 'delta': stock, 'reason': 'initial', 'user_id': get_current_user_id()}
+            ])
+        bump_catalog_version()
         db.session.commit()
         
         return jsonify(product.to_dict()), 201
@@ -94,12 +131,9 @@ def create_product():
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<int:product_id>', methods=['PUT'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem editar produtos.')
 def update_product(product_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem editar produtos.'}), 403
-        
         product = Product.query.get(product_id)
         if not product:
             return jsonify({'error': 'Produto não encontrado'}), 404
@@ -114,10 +148,10 @@ def update_product(product_id):
         
         if 'price' in data:
             try:
-                price = float(data['price'])
+                price = to_cents(data['price'])
                 if price < 0:
                     return jsonify({'error': 'Preço deve ser um valor positivo'}), 400
-                product.price = price
+                product.price_cents = price
             except ValueError:
                 return jsonify({'error': 'Preço deve ser um número'}), 400
         
@@ -126,7 +160,7 @@ def update_product(product_id):
                 stock = int(data['stock'])
                 if stock < 0:
                     return jsonify({'error': 'Estoque deve ser um valor positivo'}), 400
-                product.stock = stock
+                set_stock(product.id, stock, get_current_user_id())
             except ValueError:
                 return jsonify({'error': 'Estoque deve ser um inteiro'}), 400
         
@@ -136,6 +170,7 @@ def update_product(product_id):
                 return jsonify({'error': 'Categoria não encontrada'}), 404
             product.category_id = data['category_id']
         
+        bump_catalog_version()
         db.session.commit()
         return jsonify(product.to_dict()), 200
         
@@ -144,17 +179,22 @@ def update_product(product_id):
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<int:product_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem deletar produtos.')
 def delete_product(product_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem deletar produtos.'}), 403
-        
         product = Product.query.get(product_id)
         if not product:
             return jsonify({'error': 'Produto não encontrado'}), 404
         
+        # Verificar se há vendas do produto (chaves estrangeiras ativas no SQLite)
+        if db.session.query(SaleItem.query.filter(SaleItem.product_id == product_id).exists()).scalar():
+            return jsonify({'error': 'Não é possível deletar produto com vendas registradas'}), 400
+        
+        # Sem vendas, o livro do produto só tem estoque inicial, reposições e
+        # ajustes: saem junto com ele (o histórico de vendas nunca é apagado)
+        StockMovement.query.filter(StockMovement.product_id == product_id).delete(synchronize_session=False)
         db.session.delete(product)
+        bump_catalog_version()
         db.session.commit()
         
         return jsonify({'message': 'Produto deletado com sucesso'}), 200
@@ -164,12 +204,9 @@ def delete_product(product_id):
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<int:product_id>/stock', methods=['PUT'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem atualizar estoque.')
 def update_stock(product_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem atualizar estoque.'}), 403
-        
         product = Product.query.get(product_id)
         if not product:
             return jsonify({'error': 'Produto não encontrado'}), 404
@@ -187,7 +224,9 @@ def update_stock(product_id):
         except ValueError:
             return jsonify({'error': 'Estoque deve ser um inteiro'}), 400
         
-        product.stock = new_stock
+        # Ajuste manual (inventário): grava a diferença no livro de movimentações
+        set_stock(product.id, new_stock, get_current_user_id())
+        bump_stock_version()
         db.session.commit()
         
         return jsonify(product.to_dict()), 200
@@ -196,3 +235,45 @@ def update_stock(product_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@products_bp.route('/<int:product_id>/restock', methods=['POST'])
+@admin_required('Acesso negado. Apenas administradores podem atualizar estoque.')
+def restock_product(product_id):
+    try:
+        product = Product.query.get(product_id)
+        if not product:
+            return jsonify({'error': 'Produto não encontrado'}), 404
+        
+        data = request.get_json()
+        try:
+            quantity = int(data.get('quantity'))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Quantidade deve ser um inteiro'}), 400
+        if quantity <= 0:
+            return jsonify({'error': 'Quantidade deve ser maior que zero'}), 400
+        
+        record_movements([
+            {'product_id': product.id, 'delta': quantity, 'reason': 'restock', 'user_id': get_current_user_id()}
+        ])
+        bump_stock_version()
+        db.session.commit()
+        
+        return jsonify(product.to_dict()), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@products_bp.route('/<int:product_id>/stock/movements', methods=['GET'])
+@admin_required('Acesso negado. Apenas administradores podem ver o histórico de estoque.')
+@use_read_replica
+def get_stock_movements(product_id):
+    try:
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        movements = StockMovement.query.filter(
+            StockMovement.product_id == product_id
+        ).order_by(StockMovement.id.desc()).limit(limit).all()
+        return jsonify([movement.to_dict() for movement in movements]), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
@@ -1,51 +1,137 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.database import db
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
+from src.models.database import db, use_read_replica
 from src.models.user import User
 from src.models.sale import Sale, SaleItem
 from src.models.product import Product
-from datetime import datetime, timedelta
-from sqlalchemy import func
+from src.models.catalog import bump_stock_version
+from src.models.stock import record_movements
+from src.models.daily_sales import DailySales, DailyProductSales, record_sale, record_sales
+from src.utils.pagination import decode_cursor, fetch_page, requested_per_page, wants_cursor, wants_total
+from src.utils.cache import TTLCache
+from src.utils.auth import admin_required, get_current_user_id, is_admin
+from src.utils.fields import requested_fields, requested_includes
+from src.utils.money import from_cents
+from datetime import datetime, timedelta, timezone
+import csv
+import io
+import json
+from flask import current_app
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.exc import IntegrityError
 
 sales_bp = Blueprint('sales', __name__)
 
-def require_admin():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user and user.role == 'admin'
+# Cache do resumo de vendas (dashboard); invalidado a cada nova venda
+summary_cache = TTLCache()
+
+def parse_cart(items):
+    # Retorna (cart, erro); cart é uma lista de (product_id, quantity)
+    if not items or not isinstance(items, list):
+        return None, 'Lista de itens é obrigatória'
+    
+    cart = []
+    for item in items:
+        if not isinstance(item, dict):
+            return None, 'Cada item deve ser um objeto com product_id e quantity'
+        
+        product_id = item.get('product_id')
+        quantity = item.get('quantity')
+        
+        if not product_id or not quantity:
+            return None, 'product_id e quantity são obrigatórios para cada item'
+        
+        try:
+            quantity = int(quantity)
+        except (TypeError, ValueError):
+            return None, 'Quantidade deve ser um inteiro'
+        if quantity <= 0:
+            return None, 'Quantidade deve ser maior que zero'
+        
+        try:
+            product_id = int(product_id)
+        except (TypeError, ValueError):
+            return None, 'product_id deve ser um inteiro'
+        
+        cart.append((product_id, quantity))
+    
+    return cart, None
+
+def sale_date_filters():
+    # Filtros de data (start_date/end_date) da query string; retorna (filtros, erro)
+    filters = []
+    
+    start_date = request.args.get('start_date')
+    if start_date:
+        try:
+            filters.append(Sale.timestamp >= datetime.fromisoformat(start_date))
+        except ValueError:
+            return None, 'Formato de data inválido para start_date'
+    
+    end_date = request.args.get('end_date')
+    if end_date:
+        try:
+            filters.append(Sale.timestamp <= datetime.fromisoformat(end_date))
+        except ValueError:
+            return None, 'Formato de data inválido para end_date'
+    
+    return filters, None
 
 @sales_bp.route('/', methods=['GET'])
 @jwt_required()
+@use_read_replica
 def get_sales():
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
         
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
+        per_page = requested_per_page(20)
+        
+        # Campos da resposta (?fields=) e itens (?include=items); sem fields a
+        # resposta continua completa, com os itens
+        try:
+            fields = requested_fields(Sale.FIELDS)
+            includes = requested_includes(('items',))
+            include_items = fields is None or 'items' in includes
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        query = Sale.query
+        query = Sale.query.options(*Sale.eager_options(fields, include_items))
         
         # Se não for admin, mostrar apenas as próprias vendas
-        if current_user.role != 'admin':
+        if not is_admin():
             query = query.filter(Sale.user_id == current_user_id)
         
         # Filtros de data
-        if start_date:
-            try:
-                start_date = datetime.fromisoformat(start_date)
-                query = query.filter(Sale.timestamp >= start_date)
-            except ValueError:
-                return jsonify({'error': 'Formato de data inválido para start_date'}), 400
-        
-        if end_date:
-            try:
-                end_date = datetime.fromisoformat(end_date)
-                query = query.filter(Sale.timestamp <= end_date)
-            except ValueError:
-                return jsonify({'error': 'Formato de data inválido para end_date'}), 400
+        date_filters, error = sale_date_filters()
+        if error:
+            return jsonify({'error': error}), 400
+        query = query.filter(*date_filters)
+        
+        # Paginação por cursor (opcional): busca por (timestamp, id) sem OFFSET
+        if wants_cursor():
+            page_query = query.order_by(Sale.timestamp.desc(), Sale.id.desc())
+            cursor = request.args.get('cursor')
+            if cursor:
+                try:
+                    cursor_timestamp, cursor_id = decode_cursor(cursor)
+                    cursor_timestamp = datetime.fromisoformat(cursor_timestamp)
+                except (ValueError, TypeError):
+                    return jsonify({'error': 'Cursor inválido'}), 400
+                page_query = page_query.filter(
+                    tuple_(Sale.timestamp, Sale.id) < (cursor_timestamp, cursor_id)
+                )
+            
+            sales, next_cursor = fetch_page(
+                page_query, per_page, lambda sale: [sale.timestamp.isoformat(), sale.id]
+            )
+            response = {
+                'sales': [sale.to_dict(fields, include_items) for sale in sales],
+                'next_cursor': next_cursor
+            }
+            if wants_total():
+                response['total'] = query.count()
+            return jsonify(response), 200
         
         sales = query.order_by(Sale.timestamp.desc()).paginate(
             page=page, 
@@ -54,7 +140,7 @@ def get_sales():
         )
         
         return jsonify({
-            'sales': [sale.to_dict() for sale in sales.items],
+            'sales': [sale.to_dict(fields, include_items) for sale in sales.items],
             'total': sales.total,
             'pages': sales.pages,
             'current_page': page
@@ -63,75 +149,172 @@ def get_sales():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+EXPORT_COLUMNS = [
+    'sale_id', 'timestamp', 'user_id', 'user_username', 'total_amount',
+    'item_id', 'product_id', 'product_name', 'quantity', 'price_at_sale', 'subtotal'
+]
+
+@sales_bp.route('/export', methods=['GET'])
+@jwt_required()
+@use_read_replica
+def export_sales():
+    # Exportação em streaming: uma linha por item de venda, lida do banco em
+    # blocos (yield_per), sem montar a lista inteira em memória.
+    try:
+        current_user_id = get_current_user_id()
+        
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return jsonify({'error': 'Formato deve ser csv ou ndjson'}), 400
+        
+        date_filters, error = sale_date_filters()
+        if error:
+            return jsonify({'error': error}), 400
+        
+        stmt = db.select(
+            Sale.id, Sale.timestamp, Sale.user_id, User.username, Sale.total_cents,
+            SaleItem.id, SaleItem.product_id, Product.name, SaleItem.quantity, SaleItem.price_at_sale_cents
+        ).select_from(Sale).join(
+            SaleItem, SaleItem.sale_id == Sale.id
+        ).outerjoin(
+            User, User.id == Sale.user_id
+        ).outerjoin(
+            Product, Product.id == SaleItem.product_id
+        ).where(*date_filters).order_by(Sale.timestamp, Sale.id, SaleItem.id)
+        
+        # Se não for admin, exportar apenas as próprias vendas
+        if not is_admin():
+            stmt = stmt.where(Sale.user_id == current_user_id)
+        
+        chunk_size = current_app.config.get('EXPORT_CHUNK_SIZE', 1000)
+        
+        def flatten(row):
+            (sale_id, timestamp, user_id, username, total_cents,
+             item_id, product_id, product_name, quantity, price_cents) = row
+            return [
+                sale_id, timestamp.isoformat() if timestamp else None, user_id, username,
+                from_cents(total_cents), item_id, product_id, product_name, quantity,
+                from_cents(price_cents), from_cents(quantity * price_cents)
+            ]
+        
+        def generate():
+            result = db.session.execute(stmt.execution_options(yield_per=chunk_size))
+            buffer = io.StringIO()
+            writer = csv.writer(buffer) if export_format == 'csv' else None
+            
+            if writer:
+                writer.writerow(EXPORT_COLUMNS)
+            
+            for rows in result.partitions():
+                for row in rows:
+                    values = flatten(row)
+                    if writer:
+                        writer.writerow(values)
+                    else:
+                        buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                        buffer.write('\n')
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        filename = f'vendas.{export_format}'
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @sales_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_sale():
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         data = request.get_json()
-        items = data.get('items', [])
         
-        if not items:
-            return jsonify({'error': 'Lista de itens é obrigatória'}), 400
+        # Validar itens
+        cart, error = parse_cart(data.get('items', []))
+        if error:
+            return jsonify({'error': error}), 400
         
-        total_amount = 0
+        total_cents = 0
         sale_items = []
         
-        # Validar itens e calcular total
-        for item in items:
-            product_id = item.get('product_id')
-            quantity = item.get('quantity')
-            
-            if not product_id or not quantity:
-                return jsonify({'error': 'product_id e quantity são obrigatórios para cada item'}), 400
-            
-            try:
-                quantity = int(quantity)
-                if quantity <= 0:
-                    return jsonify({'error': 'Quantidade deve ser maior que zero'}), 400
-            except ValueError:
-                return jsonify({'error': 'Quantidade deve ser um inteiro'}), 400
-            
-            product = Product.query.get(product_id)
+        # Buscar todos os produtos do carrinho em uma única consulta
+        product_ids = {product_id for product_id, _ in cart}
+        products = {
+            product.id: product
+            for product in Product.query.filter(Product.id.in_(product_ids)).all()
+        }
+        
+        # Quantidade total pedida por produto (o mesmo produto pode aparecer em várias linhas)
+        requested = {}
+        for product_id, quantity in cart:
+            product = products.get(product_id)
             if not product:
                 return jsonify({'error': f'Produto com ID {product_id} não encontrado'}), 404
+            requested[product_id] = requested.get(product_id, 0) + quantity
+        
+        # Calcular total
+        for product_id, quantity in cart:
+            product = products[product_id]
             
-            if product.stock < quantity:
-                return jsonify({'error': f'Estoque insuficiente para o produto {product.name}. Disponível: {product.stock}'}), 400
+            if product.current_stock < requested[product_id]:
+                return jsonify({'error': f'Estoque insuficiente para o produto {product.name}. Disponível: {product.current_stock}'}), 400
             
-            subtotal = float(product.price) * quantity
-            total_amount += subtotal
+            # Centavos: soma inteira e exata
+            total_cents += product.price_cents * quantity
             
             sale_items.append({
                 'product': product,
                 'quantity': quantity,
-                'price_at_sale': product.price
+                'price_at_sale_cents': product.price_cents
             })
         
         # Criar a venda
         sale = Sale(
             user_id=current_user_id,
-            total_amount=total_amount
+            total_cents=total_cents
         )
         
         db.session.add(sale)
         db.session.flush()  # Para obter o ID da venda
         
-        # Criar itens da venda e atualizar estoque
+        # Criar itens da venda
         for item_data in sale_items:
             sale_item = SaleItem(
                 sale_id=sale.id,
                 product_id=item_data['product'].id,
                 quantity=item_data['quantity'],
-                price_at_sale=item_data['price_at_sale']
+                price_at_sale_cents=item_data['price_at_sale_cents']
             )
             
-            # Atualizar estoque
-            item_data['product'].stock -= item_data['quantity']
-            
             db.session.add(sale_item)
         
+        # Baixa de estoque no livro de movimentações (sem UPDATE na linha do produto)
+        failed_product_id = record_movements([
+            {'product_id': product_id, 'delta': -quantity, 'reason': 'sale', 'sale_id': sale.id, 'user_id': current_user_id}
+            for product_id, quantity in sorted(requested.items())
+        ])
+        if failed_product_id is not None:
+            db.session.rollback()
+            product = products[failed_product_id]
+            return jsonify({'error': f'Estoque insuficiente para o produto {product.name}'}), 400
+        
+        # Atualizar agregações diárias na mesma transação
+        record_sale(sale.timestamp, sale.total_cents, [
+            (item_data['product'].id, item_data['quantity'], item_data['price_at_sale_cents'] * item_data['quantity'])
+            for item_data in sale_items
+        ])
+        
+        # Estoque mudou: invalida o ETag das listagens de produtos
+        bump_stock_version()
+        
         db.session.commit()
+        summary_cache.invalidate()
         
         return jsonify(sale.to_dict()), 201
         
@@ -139,52 +322,235 @@ def create_sale():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@sales_bp.route('/reports/summary', methods=['GET'])
+@sales_bp.route('/batch', methods=['POST'])
 @jwt_required()
-def get_sales_summary():
+def create_sales_batch():
+    # Importação de vendas feitas offline pelo PDV: valida o estoque do lote
+    # inteiro de uma vez e grava tudo em uma única transação. O client_id de
+    # cada venda fica gravado (único por usuário): num reenvio, as vendas já
+    # importadas voltam como duplicadas em vez de serem gravadas de novo.
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem acessar relatórios.'}), 403
+        current_user_id = get_current_user_id()
+        data = request.get_json()
+        entries = data.get('sales', [])
+        
+        if not entries or not isinstance(entries, list):
+            return jsonify({'error': 'Lista de vendas é obrigatória'}), 400
+        
+        max_batch = current_app.config.get('SALES_BATCH_MAX', 500)
+        if len(entries) > max_batch:
+            return jsonify({'error': f'Máximo de {max_batch} vendas por lote'}), 400
+        
+        results = []
+        parsed = []
+        
+        # Validar cada venda (client_id, itens e timestamp do cliente)
+        for index, entry in enumerate(entries):
+            result = {'index': index}
+            results.append(result)
+            
+            if not isinstance(entry, dict):
+                result.update(status='error', error='Cada venda deve ser um objeto')
+                continue
+            
+            client_id = entry.get('client_id')
+            result['client_id'] = client_id
+            if client_id is not None:
+                if isinstance(client_id, bool) or not isinstance(client_id, (str, int)) or not 0 < len(str(client_id)) <= 64:
+                    result.update(status='error', error='client_id deve ser um texto de até 64 caracteres')
+                    continue
+                client_id = str(client_id)
+            
+            cart, error = parse_cart(entry.get('items', []))
+            if error:
+                result.update(status='error', error=error)
+                continue
+            
+            timestamp = entry.get('timestamp')
+            if timestamp:
+                try:
+                    timestamp = datetime.fromisoformat(timestamp)
+                except (ValueError, TypeError):
+                    result.update(status='error', error='Formato de data inválido para timestamp')
+                    continue
+                # Vendas são gravadas em UTC sem fuso
+                if timestamp.tzinfo is not None:
+                    timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            else:
+                timestamp = datetime.utcnow()
+            
+            parsed.append((result, timestamp, cart, client_id))
+        
+        # Vendas já importadas em um envio anterior (mesmo usuário e client_id)
+        client_ids = {client_id for _, _, _, client_id in parsed if client_id is not None}
+        imported = dict(
+            db.session.query(Sale.client_id, Sale.id).filter(
+                Sale.user_id == current_user_id,
+                Sale.client_id.in_(client_ids)
+            ).all()
+        ) if client_ids else {}
+        
+        pending = []
+        seen = set()
+        for result, timestamp, cart, client_id in parsed:
+            if client_id in imported:
+                result.update(status='duplicate', sale_id=imported[client_id])
+                continue
+            if client_id is not None:
+                if client_id in seen:
+                    result.update(status='error', error='client_id repetido no lote')
+                    continue
+                seen.add(client_id)
+            pending.append((result, timestamp, cart, client_id))
+        parsed = pending
+        
+        # Buscar todos os produtos do lote em uma única consulta
+        product_ids = {product_id for _, _, cart, _ in parsed for product_id, _ in cart}
+        products = {
+            product.id: product
+            for product in Product.query.filter(Product.id.in_(product_ids)).all()
+        } if product_ids else {}
+        
+        # Reservar estoque na ordem das vendas, considerando o lote inteiro
+        available = {product_id: product.current_stock for product_id, product in products.items()}
+        accepted = []
+        
+        for result, timestamp, cart, client_id in parsed:
+            missing = [product_id for product_id, _ in cart if product_id not in products]
+            if missing:
+                result.update(status='error', error=f'Produto com ID {missing[0]} não encontrado')
+                continue
+            
+            needed = {}
+            for product_id, quantity in cart:
+                needed[product_id] = needed.get(product_id, 0) + quantity
+            
+            short = [product_id for product_id, quantity in needed.items() if available[product_id] < quantity]
+            if short:
+                product = products[short[0]]
+                result.update(
+                    status='error',
+                    error=f'Estoque insuficiente para o produto {product.name}. Disponível: {available[product.id]}'
+                )
+                continue
+            
+            for product_id, quantity in needed.items():
+                available[product_id] -= quantity
+            
+            total_cents = sum(products[product_id].price_cents * quantity for product_id, quantity in cart)
+            accepted.append((result, timestamp, cart, total_cents, needed, client_id))
+        
+        if accepted:
+            # Inserir as vendas em lote (o ORM agrupa os INSERTs) e depois os itens com executemany
+            sales = [
+                Sale(user_id=current_user_id, total_cents=total_cents, timestamp=timestamp, client_id=client_id)
+                for _, timestamp, _, total_cents, _, client_id in accepted
+            ]
+            db.session.add_all(sales)
+            db.session.flush()
+            
+            item_rows = []
+            for sale, (result, _, cart, _, _, _) in zip(sales, accepted):
+                for product_id, quantity in cart:
+                    item_rows.append({
+                        'sale_id': sale.id,
+                        'product_id': product_id,
+                        'quantity': quantity,
+                        'price_at_sale_cents': products[product_id].price_cents
+                    })
+                result.update(status='created', sale_id=sale.id)
+            db.session.execute(db.insert(SaleItem), item_rows)
+            
+            # Baixa de estoque no livro: uma movimentação por produto de cada venda
+            movements = []
+            for sale, (_, _, _, _, needed, _) in zip(sales, accepted):
+                movements.extend(
+                    {'product_id': product_id, 'delta': -quantity, 'reason': 'sale', 'sale_id': sale.id, 'user_id': current_user_id}
+                    for product_id, quantity in sorted(needed.items())
+                )
+            failed_product_id = record_movements(movements)
+            if failed_product_id is not None:
+                db.session.rollback()
+                product = products[failed_product_id]
+                return jsonify({'error': f'Estoque do produto {product.name} mudou durante a importação. Tente novamente.'}), 409
+            
+            # Atualizar agregações diárias na mesma transação
+            record_sales([
+                (timestamp, total_cents, [
+                    (product_id, quantity, products[product_id].price_cents * quantity)
+                    for product_id, quantity in cart
+                ])
+                for _, timestamp, cart, total_cents, _, _ in accepted
+            ])
+            
+            bump_stock_version()
+            db.session.commit()
+            summary_cache.invalidate()
         
-        # Vendas de hoje
+        duplicates = sum(1 for result in results if result.get('status') == 'duplicate')
+        return jsonify({
+            'created': len(accepted),
+            'duplicates': duplicates,
+            'failed': len(entries) - len(accepted) - duplicates,
+            'results': results
+        }), 200
+        
+    except IntegrityError:
+        # Outro envio do mesmo lote gravou um client_id ao mesmo tempo
+        db.session.rollback()
+        return jsonify({'error': 'Vendas do lote foram importadas por outro envio. Tente novamente.'}), 409
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@sales_bp.route('/reports/summary', methods=['GET'])
+@admin_required('Acesso negado. Apenas administradores podem acessar relatórios.')
+@use_read_replica
+def get_sales_summary():
+    try:
         today = datetime.now().date()
-        today_sales = db.session.query(func.sum(Sale.total_amount)).filter(
-            func.date(Sale.timestamp) == today
-        ).scalar() or 0
+        cache_key = ('summary', today)
+        summary = summary_cache.get(cache_key)
+        if summary is not None:
+            return jsonify(summary), 200
         
-        # Vendas do mês
+        # Relatórios leem as agregações diárias (daily_sales / daily_product_sales)
         start_of_month = today.replace(day=1)
-        month_sales = db.session.query(func.sum(Sale.total_amount)).filter(
-            Sale.timestamp >= start_of_month
-        ).scalar() or 0
-        
-        # Total de vendas
-        total_sales = db.session.query(func.sum(Sale.total_amount)).scalar() or 0
         
-        # Número de vendas hoje
-        today_count = Sale.query.filter(func.date(Sale.timestamp) == today).count()
+        # Totais de hoje, do mês e geral em uma única consulta (agregação condicional)
+        totals = db.session.query(
+            func.sum(case((DailySales.day == today, DailySales.total_cents), else_=0)),
+            func.sum(case((DailySales.day >= start_of_month, DailySales.total_cents), else_=0)),
+            func.sum(DailySales.total_cents),
+            func.sum(case((DailySales.day == today, DailySales.sales_count), else_=0))
+        ).one()
+        today_sales, month_sales, total_sales, today_count = [value or 0 for value in totals]
         
         # Produtos mais vendidos (últimos 30 dias)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
+        thirty_days_ago = (datetime.now() - timedelta(days=30)).date()
         top_products = db.session.query(
             Product.name,
-            func.sum(SaleItem.quantity).label('total_sold')
-        ).join(SaleItem).join(Sale).filter(
-            Sale.timestamp >= thirty_days_ago
+            func.sum(DailyProductSales.quantity).label('total_sold')
+        ).join(DailyProductSales, DailyProductSales.product_id == Product.id).filter(
+            DailyProductSales.day >= thirty_days_ago
         ).group_by(Product.id, Product.name).order_by(
-            func.sum(SaleItem.quantity).desc()
+            func.sum(DailyProductSales.quantity).desc()
         ).limit(5).all()
         
-        return jsonify({
-            'today_sales': float(today_sales),
-            'month_sales': float(month_sales),
-            'total_sales': float(total_sales),
-            'today_count': today_count,
+        summary = {
+            'today_sales': from_cents(int(today_sales)),
+            'month_sales': from_cents(int(month_sales)),
+            'total_sales': from_cents(int(total_sales)),
+            'today_count': int(today_count),
             'top_products': [
                 {'name': product.name, 'total_sold': int(product.total_sold)}
                 for product in top_products
             ]
-        }), 200
+        }
+        summary_cache.set(cache_key, summary, ttl=current_app.config.get('SUMMARY_CACHE_TTL', 5))
+        
+        return jsonify(summary), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -193,15 +559,14 @@ def get_sales_summary():
 @jwt_required()
 def get_sale(sale_id):
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
         
-        sale = Sale.query.get(sale_id)
+        sale = Sale.query.options(*Sale.eager_options()).get(sale_id)
         if not sale:
             return jsonify({'error': 'Venda não encontrada'}), 404
         
         # Se não for admin, só pode ver as próprias vendas
-        if current_user.role != 'admin' and sale.user_id != current_user_id:
+        if not is_admin() and sale.user_id != current_user_id:
             return jsonify({'error': 'Acesso negado'}), 403
         
         return jsonify(sale.to_dict()), 200
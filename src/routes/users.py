@@ -1,22 +1,15 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from src.models.database import db
 from src.models.user import User
+from src.utils.auth import admin_required, get_current_user_id, revoke_user_tokens, token_versions
+from src.utils.passwords import PasswordHashBusy
 
 users_bp = Blueprint('users', __name__)
 
-def require_admin():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user and user.role == 'admin'
-
 @users_bp.route('/', methods=['GET'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem acessar esta funcionalidade.')
 def get_users():
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem acessar esta funcionalidade.'}), 403
-        
         users = User.query.all()
         return jsonify([user.to_dict() for user in users]), 200
         
@@ -24,12 +17,9 @@ def get_users():
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/', methods=['POST'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem criar usuários.')
 def create_user():
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem criar usuários.'}), 403
-        
         data = request.get_json()
         username = data.get('username')
         password = data.get('password')
@@ -54,17 +44,18 @@ def create_user():
         
         return jsonify(user.to_dict()), 201
         
+    except PasswordHashBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Servidor ocupado calculando senhas. Tente novamente em instantes.'}), 503, {'Retry-After': '1'}
+    
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/<int:user_id>', methods=['PUT'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem editar usuários.')
 def update_user(user_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem editar usuários.'}), 403
-        
         user = User.query.get(user_id)
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
@@ -80,37 +71,43 @@ def update_user(user_id):
         
         if 'password' in data and data['password']:
             user.set_password(data['password'])
+            revoke_user_tokens(user)
         
         if 'role' in data:
             if data['role'] not in ['admin', 'funcionario']:
                 return jsonify({'error': 'Role deve ser admin ou funcionario'}), 400
+            if data['role'] != user.role:
+                # A role vai no token: tokens antigos deixam de valer
+                revoke_user_tokens(user)
             user.role = data['role']
         
         db.session.commit()
         return jsonify(user.to_dict()), 200
         
+    except PasswordHashBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Servidor ocupado calculando senhas. Tente novamente em instantes.'}), 503, {'Retry-After': '1'}
+    
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/<int:user_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required('Acesso negado. Apenas administradores podem deletar usuários.')
 def delete_user(user_id):
     try:
-        if not require_admin():
-            return jsonify({'error': 'Acesso negado. Apenas administradores podem deletar usuários.'}), 403
-        
         user = User.query.get(user_id)
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
         # Não permitir deletar o próprio usuário
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         if user_id == current_user_id:
             return jsonify({'error': 'Não é possível deletar o próprio usuário'}), 400
         
         db.session.delete(user)
         db.session.commit()
+        token_versions.invalidate(user_id)
         
         return jsonify({'message': 'Usuário deletado com sucesso'}), 200
         
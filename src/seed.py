@@ -0,0 +1,204 @@
+import random
+from datetime import datetime, timedelta
+
+# Gerador de dados sintéticos para testes de escala (flask seed).
+# A mesma semente com os mesmos parâmetros, aplicada a um banco vazio,
+# gera exatamente os mesmos dados.
+
+# Peso relativo de cada hora do dia (picos no fim da manhã e no fim da tarde)
+HOUR_WEIGHTS = [
+    1, 1, 1, 1, 1, 2, 4, 8, 14, 20, 26, 30,
+    28, 22, 18, 18, 22, 28, 30, 24, 16, 10, 5, 2,
+]
+
+# Peso relativo de cada dia da semana (segunda = 0); sábado é o dia mais cheio
+WEEKDAY_WEIGHTS = [0.9, 0.85, 0.9, 1.0, 1.2, 1.5, 0.7]
+
+# Quantidade de itens por venda e quantidade por item
+ITEMS_PER_SALE = ([1, 2, 3, 4, 5, 6], [40, 25, 15, 10, 6, 4])
+QUANTITY_PER_ITEM = ([1, 2, 3, 4, 5, 10], [60, 20, 8, 6, 4, 2])
+
+ADJECTIVES = ['Premium', 'Clássico', 'Econômico', 'Orgânico', 'Compacto', 'Artesanal', 'Importado', 'Tradicional']
+NOUNS = ['Café', 'Caderno', 'Sabonete', 'Biscoito', 'Caneta', 'Chá', 'Suco', 'Toalha', 'Vela', 'Mochila', 'Queijo', 'Copo']
+
+def _cumulative(weights):
+    total = 0
+    cumulative = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+def _distribute(total, weights):
+    # Divide total proporcionalmente aos pesos, sem perder o resto
+    weight_sum = sum(weights)
+    counts = [int(total * weight / weight_sum) for weight in weights]
+    for index in range(total - sum(counts)):
+        counts[index % len(counts)] += 1
+    return counts
+
+def _next_id(connection, table):
+    return (connection.execute(
+        table.select().with_only_columns(table.c.id).order_by(table.c.id.desc()).limit(1)
+    ).scalar() or 0) + 1
+
+def seed_database(seed=42, users=50, categories=20, products=2000, sales=100000,
+                  days=365, start_date=datetime(2024, 1, 1), batch_size=10000, echo=print):
+    from src.models.database import db
+    from src.models.user import User
+    from src.models.category import Category
+    from src.models.product import Product
+    from src.models.sale import Sale, SaleItem
+    from src.models.catalog import bump_catalog_version, bump_stock_version
+    from src.models.daily_sales import rebuild_daily_sales
+    from src.models.stock import StockMovement
+    from src.utils.passwords import hash_password
+    
+    rng = random.Random(seed)
+    users_table = User.__table__
+    categories_table = Category.__table__
+    products_table = Product.__table__
+    sales_table = Sale.__table__
+    items_table = SaleItem.__table__
+    movements_table = StockMovement.__table__
+    
+    with db.engine.begin() as connection:
+        # Usuários: todos com a mesma senha, hash calculado uma vez só
+        password_hash = hash_password('senha123')
+        first_user = _next_id(connection, users_table)
+        user_ids = list(range(first_user, first_user + users))
+        connection.execute(users_table.insert(), [
+            {
+                'id': user_id,
+                'username': f'usuario{user_id}',
+                'password_hash': password_hash,
+                'role': 'funcionario',
+                'token_version': 0,
+                'created_at': start_date,
+            }
+            for user_id in user_ids
+        ])
+        
+        first_category = _next_id(connection, categories_table)
+        category_ids = list(range(first_category, first_category + categories))
+        connection.execute(categories_table.insert(), [
+            {'id': category_id, 'name': f'Categoria {category_id}', 'created_at': start_date}
+            for category_id in category_ids
+        ])
+        
+        first_product = _next_id(connection, products_table)
+        product_ids = list(range(first_product, first_product + products))
+        movement_id = _next_id(connection, movements_table)
+        prices = {}
+        product_rows = []
+        movement_rows = []
+        for product_id in product_ids:
+            # Preços com distribuição log-normal (muitos baratos, poucos caros)
+            prices[product_id] = round(min(max(rng.lognormvariate(3, 0.9), 0.5), 9999) * 100)  # centavos
+            name = f'{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} {product_id}'
+            stock = rng.randint(0, 500)
+            product_rows.append({
+                'id': product_id,
+                'name': name,
+                'description': f'Produto gerado automaticamente ({product_id})',
+                'price_cents': prices[product_id],
+                'stock': stock,
+                'stock_movement_id': movement_id if stock else 0,
+                'category_id': rng.choice(category_ids),
+                'created_at': start_date,
+            })
+            # Estoque inicial no livro, já incorporado ao snapshot
+            if stock:
+                movement_rows.append({
+                    'id': movement_id,
+                    'product_id': product_id,
+                    'delta': stock,
+                    'reason': 'initial',
+                    'created_at': start_date,
+                })
+                movement_id += 1
+        connection.execute(products_table.insert(), product_rows)
+        if movement_rows:
+            connection.execute(movements_table.insert(), movement_rows)
+        
+        first_sale = _next_id(connection, sales_table)
+        first_item = _next_id(connection, items_table)
+    echo(f'{users} usuários, {categories} categorias e {products} produtos criados')
+    
+    # Popularidade com cauda longa (lei de Zipf): poucos produtos vendem muito
+    by_popularity = product_ids[:]
+    rng.shuffle(by_popularity)
+    product_weights = _cumulative([1 / (rank + 1) ** 1.1 for rank in range(products)])
+    user_weights = _cumulative([1 / (rank + 1) ** 0.8 for rank in range(users)])
+    hour_weights = _cumulative(HOUR_WEIGHTS)
+    item_counts, item_count_weights = ITEMS_PER_SALE[0], _cumulative(ITEMS_PER_SALE[1])
+    quantities, quantity_weights = QUANTITY_PER_ITEM[0], _cumulative(QUANTITY_PER_ITEM[1])
+    
+    # Vendas por dia: sazonalidade semanal e crescimento ao longo do período
+    day_weights = [
+        WEEKDAY_WEIGHTS[(start_date + timedelta(days=day)).weekday()] * (1 + day / days)
+        for day in range(days)
+    ]
+    sales_per_day = _distribute(sales, day_weights)
+    
+    sale_id = first_sale
+    item_id = first_item
+    sale_rows = []
+    item_rows = []
+    created = 0
+    
+    def flush():
+        with db.engine.begin() as connection:
+            connection.execute(sales_table.insert(), sale_rows)
+            if item_rows:
+                connection.execute(items_table.insert(), item_rows)
+        sale_rows.clear()
+        item_rows.clear()
+    
+    for day, count in enumerate(sales_per_day):
+        day_start = start_date + timedelta(days=day)
+        # Horários ordenados para que os ids cresçam junto com o tempo
+        offsets = sorted(
+            rng.choices(range(24), cum_weights=hour_weights)[0] * 3600 + rng.randrange(3600)
+            for _ in range(count)
+        )
+        for offset in offsets:
+            size = rng.choices(item_counts, cum_weights=item_count_weights)[0]
+            chosen = set(rng.choices(by_popularity, cum_weights=product_weights, k=size))
+            total = 0
+            for product_id in sorted(chosen):
+                quantity = rng.choices(quantities, cum_weights=quantity_weights)[0]
+                price = prices[product_id]
+                total += price * quantity
+                item_rows.append({
+                    'id': item_id,
+                    'sale_id': sale_id,
+                    'product_id': product_id,
+                    'quantity': quantity,
+                    'price_at_sale_cents': price,
+                })
+                item_id += 1
+            sale_rows.append({
+                'id': sale_id,
+                'user_id': rng.choices(user_ids, cum_weights=user_weights)[0],
+                'total_cents': total,
+                'timestamp': day_start + timedelta(seconds=offset),
+            })
+            sale_id += 1
+            
+            if len(sale_rows) >= batch_size:
+                created += len(sale_rows)
+                flush()
+                echo(f'{created}/{sales} vendas inseridas')
+    
+    if sale_rows:
+        created += len(sale_rows)
+        flush()
+    echo(f'{created} vendas e {item_id - first_item} itens inseridos')
+    
+    # Agregações diárias e versões do catálogo e do estoque refletem os dados novos
+    with db.engine.begin() as connection:
+        rebuild_daily_sales(connection)
+    bump_catalog_version()
+    bump_stock_version()
+    db.session.commit()
@@ -0,0 +1,57 @@
+from functools import wraps
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from src.models.database import db
+from src.utils.cache import TTLCache
+
+# Autorização a partir das claims do JWT (role e versão do token), sem
+# consultar a tabela de usuários a cada requisição.
+
+# Versão atual do token de cada usuário; alterar senha/role ou remover o
+# usuário incrementa a versão e revoga os tokens antigos.
+token_versions = TTLCache(ttl=30)
+
+def token_claims(user):
+    return {'role': user.role, 'ver': user.token_version or 0}
+
+def get_current_user_id():
+    return int(get_jwt_identity())
+
+def is_admin():
+    return get_jwt().get('role') == 'admin'
+
+def admin_required(message='Acesso negado'):
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if not is_admin():
+                return jsonify({'error': message}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def revoke_user_tokens(user):
+    user.token_version = (user.token_version or 0) + 1
+    token_versions.invalidate(user.id)
+
+def current_token_version(user_id):
+    version = token_versions.get(user_id)
+    if version is None:
+        from src.models.user import User
+        version = db.session.query(User.token_version).filter(User.id == user_id).scalar()
+        # -1: usuário removido, nenhum token é válido
+        version = -1 if version is None else version
+        token_versions.set(user_id, version, ttl=current_app.config.get('TOKEN_VERSION_CACHE_TTL', 30))
+    return version
+
+def register_token_checks(jwt):
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        if 'role' not in jwt_payload or 'ver' not in jwt_payload:
+            return True
+        try:
+            user_id = int(jwt_payload['sub'])
+        except (KeyError, TypeError, ValueError):
+            return True
+        return jwt_payload['ver'] != current_token_version(user_id)
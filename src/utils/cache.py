@@ -0,0 +1,35 @@
+import threading
+import time
+
+# Cache em memória com expiração (TTL), por processo. Cada worker do
+# gunicorn tem o seu; a invalidação local vale só para o próprio worker,
+# os demais expiram pelo TTL.
+
+class TTLCache:
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+    
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+    
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
@@ -0,0 +1,24 @@
+from flask import request
+
+# Parâmetros ?fields= (campos do objeto) e ?include= (relacionamentos) das
+# listagens. Retornam None quando o parâmetro não foi enviado.
+
+def _parse(name, available):
+    value = request.args.get(name)
+    if not value:
+        return None
+    requested = {item.strip() for item in value.split(',') if item.strip()}
+    invalid = sorted(requested - set(available))
+    if invalid:
+        raise ValueError(f'Valor inválido em {name}: {invalid[0]}')
+    return requested
+
+def requested_fields(available):
+    requested = _parse('fields', available)
+    if requested is None:
+        return None
+    # Ordem fixa do modelo; o id sempre vem junto
+    return [field for field in available if field in requested or field == 'id']
+
+def requested_includes(available):
+    return _parse('include', available) or set()
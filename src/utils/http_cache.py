@@ -0,0 +1,34 @@
+import hashlib
+from functools import wraps
+from flask import make_response, request
+from src.models.catalog import current_catalog_version, current_product_version
+
+def versioned_etag(current_version):
+    # GET condicional para listagens: o ETag combina a versão dos dados
+    # (current_version) com a rota e os parâmetros; If-None-Match igual
+    # responde 304 antes de qualquer consulta da listagem.
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            params = '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+            digest = hashlib.blake2b(f'{request.path}?{params}'.encode(), digest_size=8).hexdigest()
+            etag = f'{current_version()}-{digest}'
+            
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+# Categorias não mostram estoque: vendas não invalidam o ETag delas
+catalog_etag = versioned_etag(current_catalog_version)
+
+# Produtos mostram estoque: catálogo + versão do estoque
+product_etag = versioned_etag(current_product_version)
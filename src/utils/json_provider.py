@@ -0,0 +1,63 @@
+import decimal
+from datetime import date
+from flask.json.provider import DefaultJSONProvider, _default as flask_default
+
+# Provider de JSON do app. Os to_dict() devolvem Decimal e datetime como
+# estão; a conversão (número e ISO 8601) fica no encoder. Usa orjson (em
+# requirements.txt) e cai para o json da biblioteca padrão se ele não estiver
+# instalado, ex.: em uma plataforma sem wheel do orjson.
+# JSON_PROVIDER: 'auto' (padrão), 'orjson' ou 'stdlib'.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return flask_default(obj)
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+class OrjsonJSONProvider(StdlibJSONProvider):
+    # orjson serializa datetime/date nativamente (mesmo formato do isoformat());
+    # Decimal passa pelo _default.
+    
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+    
+    def _pretty(self):
+        return (self.compact is None and self._app.debug) or self.compact is False
+    
+    def dumps(self, obj, **kwargs):
+        # Argumentos do json.dumps (indent, cls, ...) ficam com a implementação padrão
+        if set(kwargs) - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        if self._pretty():
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def make_json_provider(app):
+    choice = app.config.get('JSON_PROVIDER', 'auto')
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER=orjson, mas o pacote orjson não está instalado')
+    if choice in ('auto', 'orjson') and orjson is not None:
+        return OrjsonJSONProvider(app)
+    return StdlibJSONProvider(app)
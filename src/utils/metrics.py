@@ -0,0 +1,206 @@
+import atexit
+import json
+import os
+import threading
+import time
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Métricas por requisição (latência, tempo de banco e número de comandos SQL)
+# no formato texto do Prometheus, em GET /metrics.
+#
+# Com METRICS_DIR configurado, cada processo (worker do gunicorn) grava um
+# snapshot das suas métricas em METRICS_DIR/metrics-<pid>.json, no máximo a
+# cada METRICS_FLUSH_SECONDS, e o /metrics soma os arquivos de todos os
+# workers. Arquivos de workers que já morreram continuam sendo somados para
+# que os contadores nunca diminuam; limpe a pasta a cada deploy.
+#
+# Acesso: com METRICS_TOKEN, exige "Authorization: Bearer <token>". Sem ele,
+# o /metrics só responde em debug ou nos testes; em produção devolve 404.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+HELP = {
+    'http_requests_total': ('counter', 'Requisições atendidas'),
+    'http_request_duration_seconds': ('histogram', 'Duração da requisição'),
+    'http_request_db_seconds': ('histogram', 'Tempo gasto em comandos SQL por requisição'),
+    'http_request_db_statements': ('histogram', 'Comandos SQL executados por requisição'),
+}
+
+class MetricsRegistry:
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.flushed_at = 0
+        if directory:
+            # Último snapshot quando o worker é encerrado normalmente
+            atexit.register(self.flush, force=True)
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0, 'count': 0
+                }
+            for index, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [
+                    [name, list(labels), dict(histogram, counts=list(histogram['counts']))]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        # Grava o snapshot deste processo (escrita atômica via rename)
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self.flushed_at < self.flush_interval:
+            return
+        self.flushed_at = now
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+        with open(path + '.tmp', 'w') as snapshot_file:
+            json.dump(self.snapshot(), snapshot_file)
+        os.replace(path + '.tmp', path)
+
+    def collect(self):
+        # Snapshots de todos os processos, somados
+        if not self.directory:
+            snapshots = [self.snapshot()]
+        else:
+            self.flush(force=True)
+            snapshots = []
+            for filename in os.listdir(self.directory):
+                if filename.startswith('metrics-') and filename.endswith('.json'):
+                    try:
+                        with open(os.path.join(self.directory, filename)) as snapshot_file:
+                            snapshots.append(json.load(snapshot_file))
+                    except (OSError, ValueError):
+                        continue  # worker sendo encerrado ou arquivo removido
+
+        counters = {}
+        histograms = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(tuple(label) for label in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, histogram in snapshot['histograms']:
+                key = (name, tuple(tuple(label) for label in labels))
+                total = histograms.get(key)
+                if total is None:
+                    histograms[key] = dict(histogram, counts=list(histogram['counts']))
+                    continue
+                total['counts'] = [a + b for a, b in zip(total['counts'], histogram['counts'])]
+                total['sum'] += histogram['sum']
+                total['count'] += histogram['count']
+        return counters, histograms
+
+    def render(self):
+        counters, histograms = self.collect()
+        lines = []
+        for metric, (kind, description) in HELP.items():
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} {kind}')
+            for (name, labels), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(f'{name}{_labels(labels)} {value}')
+            for (name, labels), histogram in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram['buckets'], histogram['counts']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", str(bound)),))} {cumulative}')
+                lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+                lines.append(f'{name}_sum{_labels(labels)} {histogram["sum"]}')
+                lines.append(f'{name}_count{_labels(labels)} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_started'] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('query_started', None)
+    if started is None or not has_request_context() or 'request_started' not in g:
+        return
+    g.db_seconds += time.perf_counter() - started
+    g.db_statements += 1
+
+def _before_request():
+    g.request_started = time.perf_counter()
+    g.db_seconds = 0.0
+    g.db_statements = 0
+
+def _after_request(response):
+    if 'request_started' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    endpoint = request.endpoint or 'not_found'
+    labels = (('endpoint', endpoint), ('method', request.method))
+
+    registry = current_app.extensions['metrics']
+    registry.inc('http_requests_total', labels + (('status', str(response.status_code)),))
+    registry.observe('http_request_duration_seconds', labels, elapsed, LATENCY_BUCKETS)
+    registry.observe('http_request_db_seconds', labels, g.db_seconds, LATENCY_BUCKETS)
+    registry.observe('http_request_db_statements', labels, g.db_statements, STATEMENT_BUCKETS)
+    registry.flush()
+
+    response.headers.add(
+        'Server-Timing',
+        f'app;dur={elapsed * 1000:.2f}, db;dur={g.db_seconds * 1000:.2f};desc="{g.db_statements} queries"'
+    )
+    return response
+
+def metrics_view():
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token and not (current_app.debug or current_app.testing):
+        return Response('Não encontrado\n', status=404, mimetype='text/plain')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return Response('Não autorizado\n', status=401, mimetype='text/plain')
+    registry = current_app.extensions['metrics']
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+def init_metrics(app):
+    from src.models.database import db
+
+    app.extensions['metrics'] = MetricsRegistry(
+        directory=app.config.get('METRICS_DIR'),
+        flush_interval=app.config.get('METRICS_FLUSH_SECONDS', 1.0),
+    )
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,21 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Valores em dinheiro ficam no banco como centavos (inteiros): somas e
+# agregações são aritmética inteira exata. A API continua recebendo e
+# devolvendo reais (ex.: 19.9).
+
+def to_cents(value):
+    # Reais (número ou texto) -> centavos, arredondando meio centavo para cima
+    try:
+        amount = Decimal(str(value))
+    except (InvalidOperation, TypeError):
+        raise ValueError(f'Valor inválido: {value}')
+    if not amount.is_finite():
+        raise ValueError(f'Valor inválido: {value}')
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def from_cents(cents):
+    # Centavos -> reais para a resposta (float com no máximo 2 casas)
+    if cents is None:
+        return None
+    return cents / 100
@@ -0,0 +1,43 @@
+import base64
+import json
+from flask import current_app, request
+
+# Paginação por cursor (keyset): cada página é uma busca no índice,
+# sem OFFSET e sem COUNT(*) a cada requisição.
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise ValueError('Cursor inválido')
+    if not isinstance(values, list):
+        raise ValueError('Cursor inválido')
+    return values
+
+def requested_per_page(default):
+    # ?per_page= limitado a [1, MAX_PER_PAGE]; valores menores que 1 voltam ao
+    # padrão, como no paginate(). Vale para os dois modos de paginação.
+    per_page = request.args.get('per_page', default, type=int)
+    if per_page < 1:
+        return default
+    return min(per_page, current_app.config.get('MAX_PER_PAGE', 100))
+
+def wants_cursor():
+    # ?cursor= (vazio) inicia a paginação por cursor; ausente mantém page/per_page
+    return 'cursor' in request.args
+
+def wants_total():
+    return request.args.get('include_total', 'false').lower() in ('1', 'true', 'yes')
+
+def fetch_page(query, per_page, cursor_values):
+    # Busca uma linha a mais para saber se existe próxima página
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(cursor_values(rows[-1])) if has_more and rows else None
+    return rows, next_cursor
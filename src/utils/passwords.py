@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Hash de senha em um pool de threads limitado. scrypt/pbkdf2 liberam o GIL,
+# então o pool limita quantos hashes rodam ao mesmo tempo por processo e uma
+# rajada de logins não ocupa a CPU que as vendas precisam.
+#
+# Uma rajada de logins espera na fila (até PASSWORD_HASH_TIMEOUT segundos)
+# em vez de ser recusada: com os padrões, 2 hashes rodando e até 8 na fila
+# por processo. A requisição fica bloqueada na sua thread enquanto espera,
+# então o limite só protege as outras rotas se o worker tiver threads
+# sobrando: o gunicorn.conf.py usa workers gthread com
+# PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE + GUNICORN_FREE_THREADS threads.
+#
+# Fila cheia ou espera esgotada: PasswordHashBusy, que as rotas respondem com
+# 503 e Retry-After. Nada foi gravado (o hash nem começou), então o cliente
+# pode repetir a mesma requisição depois do Retry-After.
+#
+# Configuração (app.config):
+#   PASSWORD_HASH_METHOD   método do werkzeug, ex.: 'scrypt:32768:8:1' ou 'pbkdf2:sha256:600000'
+#   PASSWORD_HASH_WORKERS  hashes simultâneos por processo
+#   PASSWORD_HASH_QUEUE    hashes aguardando na fila antes de recusar
+#   PASSWORD_HASH_TIMEOUT  segundos na fila antes de desistir (padrão 5);
+#                          um hash que já começou sempre vai até o fim
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE = 8
+DEFAULT_TIMEOUT = 5
+
+class PasswordHashBusy(Exception):
+    pass
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+
+def _pool():
+    # Criado sob demanda: cada worker do gunicorn cria o seu depois do fork
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = current_app.config.get('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+                queue = current_app.config.get('PASSWORD_HASH_QUEUE', DEFAULT_QUEUE)
+                _slots = threading.BoundedSemaphore(workers + queue)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    return _executor, _slots
+
+def _run(func, *args):
+    # Vaga na fila sem esperar: fila cheia já significa espera longa
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordHashBusy()
+    try:
+        future = executor.submit(func, *args)
+        try:
+            return future.result(timeout=current_app.config.get('PASSWORD_HASH_TIMEOUT', DEFAULT_TIMEOUT))
+        except TimeoutError:
+            # Ainda na fila: sai dela; já rodando: espera terminar
+            if future.cancel():
+                raise PasswordHashBusy()
+            return future.result()
+    finally:
+        slots.release()
+
+def hash_method():
+    return current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    # 'scrypt' -> 'scrypt:32768:8:1' (prefixo gravado no hash)
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+def hash_password(password):
+    return _run(generate_password_hash, password, hash_method())
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+def needs_rehash(password_hash):
+    return password_hash.split('$', 1)[0] != _method_prefix(hash_method())
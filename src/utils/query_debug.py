@@ -0,0 +1,100 @@
+import time
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Modo de diagnóstico de consultas (opcional, desligado por padrão):
+#
+# SLOW_QUERY_MS         registra comandos mais lentos que esse limite, com o
+#                       plano de execução (EXPLAIN QUERY PLAN no SQLite)
+# N_PLUS_ONE_THRESHOLD  avisa quando o mesmo comando parametrizado se repete
+#                       esse número de vezes numa única requisição
+# N_PLUS_ONE_MODE       'warn' (log) ou 'raise' (exceção, para testes)
+
+class RepeatedQueryError(Exception):
+    pass
+
+def _explain(cursor, dialect, statement, parameters):
+    # Plano da consulta num cursor novo da mesma conexão (só SELECTs)
+    if not statement.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute(prefix + statement, parameters)
+        return '\n'.join(' | '.join(str(column) for column in row) for row in plan_cursor.fetchall())
+    except Exception as e:
+        return f'(plano indisponível: {e})'
+    finally:
+        plan_cursor.close()
+
+def _route():
+    if not has_request_context():
+        return 'fora de requisição'
+    return f'{request.method} {request.path} ({request.endpoint})'
+
+def _query_listeners(app):
+    slow_ms = app.config.get('SLOW_QUERY_MS')
+    threshold = app.config.get('N_PLUS_ONE_THRESHOLD')
+    mode = app.config.get('N_PLUS_ONE_MODE', 'warn')
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['debug_query_started'] = time.perf_counter()
+    
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('debug_query_started', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        if slow_ms and elapsed_ms >= slow_ms:
+            plan = None if executemany else _explain(cursor, conn.dialect.name, statement, parameters)
+            app.logger.warning(
+                'Consulta lenta (%.1f ms) em %s:\n%s\nParâmetros: %r\nPlano:\n%s',
+                elapsed_ms, _route(), statement, parameters, plan or '-'
+            )
+        
+        if not threshold or executemany or not has_request_context():
+            return
+        counts = g.setdefault('query_counts', Counter())
+        counts[statement] += 1
+        if counts[statement] != threshold:
+            return
+        relationship = g.get('loading_relationship')
+        origin = f'carregamento sob demanda de {relationship}' if relationship else 'fora de relacionamentos'
+        message = (
+            f'Possível N+1 em {_route()}: o mesmo comando foi executado {threshold} vezes '
+            f'({origin}):\n{statement}'
+        )
+        if mode == 'raise':
+            raise RepeatedQueryError(message)
+        app.logger.warning(message)
+    
+    return before_cursor_execute, after_cursor_execute
+
+def _track_relationship_load(orm_execute_state):
+    # Anota qual relacionamento está sendo carregado para o aviso de N+1
+    if not orm_execute_state.is_relationship_load or not has_request_context():
+        return None
+    if not current_app.config.get('N_PLUS_ONE_THRESHOLD'):
+        return None
+    previous = g.get('loading_relationship')
+    g.loading_relationship = str(orm_execute_state.loader_strategy_path.prop)
+    try:
+        return orm_execute_state.invoke_statement()
+    finally:
+        g.loading_relationship = previous
+
+def init_query_debug(app):
+    from src.models.database import db, RoutingSession
+
+    if not app.config.get('SLOW_QUERY_MS') and not app.config.get('N_PLUS_ONE_THRESHOLD'):
+        return
+
+    before_cursor_execute, after_cursor_execute = _query_listeners(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+    if not event.contains(RoutingSession, 'do_orm_execute', _track_relationship_load):
+        event.listen(RoutingSession, 'do_orm_execute', _track_relationship_load)
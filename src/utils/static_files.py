@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from flask import request, send_file
+
+# Manifesto da pasta static montado na subida do app: cada arquivo com
+# caminho, tipo, ETag forte (hash do conteúdo) e variantes pré-comprimidas
+# (.br/.gz). As requisições só consultam o dicionário, sem os.path.exists.
+
+# Pastas de saída do bundler (Vite: assets/) só têm arquivos com hash de
+# conteúdo no nome, que nunca mudam; o resto (index.html, favicon, imagens
+# copiadas de public/) é revalidado pelo ETag. Ver STATIC_IMMUTABLE_DIRS.
+DEFAULT_IMMUTABLE_DIRS = ['assets']
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Extensões de conteúdo (Accept-Encoding) em ordem de preferência
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+COMPRESSIBLE = {'.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.xml', '.map', '.wasm'}
+
+def _etag(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_manifest(static_folder, immutable_dirs=None):
+    manifest = {}
+    if immutable_dirs is None:
+        immutable_dirs = DEFAULT_IMMUTABLE_DIRS
+    immutable_prefixes = tuple(directory.strip('/') + '/' for directory in immutable_dirs)
+    if not static_folder or not os.path.isdir(static_folder):
+        return manifest
+    
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            if any(relative.endswith(suffix) for _, suffix in ENCODINGS) and os.path.exists(path.rsplit('.', 1)[0]):
+                continue  # variante comprimida, entra junto do original
+            
+            variants = {}
+            for encoding, suffix in ENCODINGS:
+                if os.path.exists(path + suffix):
+                    variants[encoding] = (path + suffix, _etag(path + suffix))
+            
+            manifest[relative] = {
+                'path': path,
+                'etag': _etag(path),
+                'mimetype': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                'cache_control': IMMUTABLE if relative.startswith(immutable_prefixes) else REVALIDATE,
+                'variants': variants,
+            }
+    return manifest
+
+def serve_static(manifest, path):
+    # Caminho desconhecido (rota do SPA) cai no index.html
+    entry = manifest.get(path) if path else None
+    if entry is None:
+        entry = manifest.get('index.html')
+        if entry is None:
+            return "index.html not found", 404
+    
+    file_path, etag, encoding = entry['path'], entry['etag'], None
+    for candidate, quality in request.accept_encodings:
+        if quality > 0 and candidate in entry['variants']:
+            encoding = candidate
+            file_path, etag = entry['variants'][candidate]
+            break
+    
+    response = send_file(
+        file_path,
+        mimetype=entry['mimetype'],
+        download_name=os.path.basename(entry['path']),
+        etag=etag,
+        conditional=True
+    )
+    response.headers['Cache-Control'] = entry['cache_control']
+    if entry['variants']:
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def compress_static(static_folder, min_size=1024):
+    # Gera .gz (e .br, se o pacote brotli estiver instalado) para arquivos de texto
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    
+    created = []
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1] not in COMPRESSIBLE or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            created.append(path + '.gz')
+            if brotli is not None:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data))
+                created.append(path + '.br')
+    return created
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.commands import bootstrap_database
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    # App apontando para um SQLite em arquivo novo, sem preparar o banco
+    def make(**config):
+        return create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+            'JWT_SECRET_KEY': 'test-secret-key-with-enough-length',
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+            'METRICS_DIR': None,
+            **config,
+        })
+    return make
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        bootstrap_database()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers(client):
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
@@ -0,0 +1,117 @@
+import sqlite3
+from decimal import Decimal
+
+from src.commands import bootstrap_database
+from src.models.database import db
+from src.models.stock import reconcile_stock
+
+# Esquema original (antes das migrações), com valores em reais
+BASELINE_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER NOT NULL PRIMARY KEY,
+    username VARCHAR(80) NOT NULL UNIQUE,
+    password_hash VARCHAR(120) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    created_at DATETIME
+);
+CREATE TABLE categories (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    created_at DATETIME
+);
+CREATE TABLE products (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    description TEXT,
+    price NUMERIC(10, 2) NOT NULL,
+    stock INTEGER NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    created_at DATETIME
+);
+CREATE TABLE sales (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    total_amount NUMERIC(10, 2) NOT NULL,
+    timestamp DATETIME
+);
+CREATE TABLE sale_items (
+    id INTEGER NOT NULL PRIMARY KEY,
+    sale_id INTEGER NOT NULL REFERENCES sales (id),
+    product_id INTEGER NOT NULL REFERENCES products (id),
+    quantity INTEGER NOT NULL,
+    price_at_sale NUMERIC(10, 2) NOT NULL
+);
+"""
+
+PRICES = {1: '19.99', 2: '0.10', 3: '0.20', 4: '1234.56'}
+
+
+def create_baseline(path):
+    connection = sqlite3.connect(path)
+    connection.executescript(BASELINE_SCHEMA)
+    connection.execute("INSERT INTO users VALUES (1, 'caixa', 'x', 'funcionario', '2024-01-01 08:00:00')")
+    connection.execute("INSERT INTO categories VALUES (1, 'Geral', '2024-01-01 08:00:00')")
+    for product_id, price in PRICES.items():
+        connection.execute(
+            'INSERT INTO products VALUES (?, ?, NULL, ?, ?, 1, NULL)',
+            (product_id, f'Produto {product_id}', price, 10 * product_id)
+        )
+    expected = Decimal('0')
+    for sale_id in range(1, 31):
+        items = [(1 + (sale_id + offset) % 4, offset + 1) for offset in range(3)]
+        total = sum(Decimal(PRICES[product_id]) * quantity for product_id, quantity in items)
+        expected += total
+        connection.execute(
+            'INSERT INTO sales VALUES (?, 1, ?, ?)',
+            (sale_id, str(total), f'2024-01-{1 + sale_id % 5:02d} 10:00:00')
+        )
+        for product_id, quantity in items:
+            connection.execute(
+                'INSERT INTO sale_items (sale_id, product_id, quantity, price_at_sale) VALUES (?, ?, ?, ?)',
+                (sale_id, product_id, quantity, PRICES[product_id])
+            )
+    connection.commit()
+    connection.close()
+    return int(expected * 100)
+
+
+def test_upgrade_from_baseline_schema(make_app, tmp_path):
+    expected_cents = create_baseline(tmp_path / 'test.db')
+    app = make_app()
+
+    with app.app_context():
+        bootstrap_database()
+        inspector = db.inspect(db.engine)
+        sale_columns = {column['name'] for column in inspector.get_columns('sales')}
+        product_columns = {column['name'] for column in inspector.get_columns('products')}
+        assert {'total_cents', 'client_id'} <= sale_columns and 'total_amount' not in sale_columns
+        assert {'price_cents', 'stock_movement_id'} <= product_columns and 'price' not in product_columns
+        assert 'ux_sales_user_id_client_id' in {index['name'] for index in inspector.get_indexes('sales')}
+
+        versions = db.session.execute(db.text('SELECT version FROM schema_migrations ORDER BY version')).scalars().all()
+        assert versions == list(range(1, 8))
+
+        # Centavos exatos, inclusive nos totais e nas agregações diárias
+        prices = dict(db.session.execute(db.text('SELECT id, price_cents FROM products')).all())
+        assert prices == {product_id: round(Decimal(price) * 100) for product_id, price in PRICES.items()}
+        assert db.session.execute(db.text('SELECT SUM(total_cents) FROM sales')).scalar() == expected_cents
+        assert db.session.execute(db.text('SELECT SUM(total_cents) FROM daily_sales')).scalar() == expected_cents
+        assert db.session.execute(db.text(
+            'SELECT SUM(quantity * price_at_sale_cents) FROM sale_items'
+        )).scalar() == expected_cents
+
+        # Estoque de cada produto virou a movimentação inicial, já no snapshot
+        stock = db.session.execute(db.text(
+            'SELECT p.id, p.stock, m.delta, m.reason FROM products p '
+            'JOIN stock_movements m ON m.id = p.stock_movement_id ORDER BY p.id'
+        )).all()
+        assert stock == [(product_id, 10 * product_id, 10 * product_id, 'initial') for product_id in PRICES]
+        assert reconcile_stock() == []
+
+    # A API continua em reais
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'}).get_json()['access_token']
+    products = client.get('/api/products/?fields=price,stock', headers={'Authorization': f'Bearer {token}'}).get_json()
+    assert [(product['price'], product['stock']) for product in products['products']] == [
+        (float(price), 10 * product_id) for product_id, price in PRICES.items()
+    ]
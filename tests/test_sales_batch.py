@@ -0,0 +1,43 @@
+def create_product(client, headers, stock):
+    category = client.post('/api/categories/', json={'name': 'Geral'}, headers=headers).get_json()
+    product = client.post('/api/products/', json={
+        'name': 'Café', 'price': '2.50', 'stock': stock, 'category_id': category['id']
+    }, headers=headers).get_json()
+    return product['id']
+
+
+def test_malformed_entries_fail_alone(client, admin_headers):
+    product_id = create_product(client, admin_headers, stock=10)
+    entries = [
+        {'client_id': 'ok', 'items': [{'product_id': product_id, 'quantity': 1}]},
+        'lixo',
+        {'items': [{'product_id': product_id, 'quantity': [1]}]},
+        {'items': [{'product_id': {'id': 1}, 'quantity': 1}]},
+        {'items': 5},
+        {'items': ['x']},
+        {'client_id': ['a'], 'items': [{'product_id': product_id, 'quantity': 1}]},
+    ]
+
+    response = client.post('/api/sales/batch', json={'sales': entries}, headers=admin_headers)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [result['status'] for result in body['results']] == ['created'] + ['error'] * 6
+    assert (body['created'], body['failed']) == (1, 6)
+
+
+def test_resent_batch_reports_duplicates(client, admin_headers):
+    product_id = create_product(client, admin_headers, stock=10)
+    batch = {'sales': [
+        {'client_id': f'pdv-{index}', 'items': [{'product_id': product_id, 'quantity': 2}]}
+        for index in range(3)
+    ]}
+
+    first = client.post('/api/sales/batch', json=batch, headers=admin_headers).get_json()
+    second = client.post('/api/sales/batch', json=batch, headers=admin_headers).get_json()
+
+    assert first['created'] == 3
+    assert (second['created'], second['duplicates'], second['failed']) == (0, 3, 0)
+    assert [result['sale_id'] for result in second['results']] == [result['sale_id'] for result in first['results']]
+    stock = client.get('/api/products/?fields=stock', headers=admin_headers).get_json()['products'][0]['stock']
+    assert stock == 4
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import event
+
+from src.models.database import db
+from src.seed import seed_database
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        seed_database(seed=1, users=5, categories=3, products=30, sales=200, days=10,
+                      echo=lambda message: None)
+    return app
+
+
+def count_statements(app, client, url, headers):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert response.status_code == 200, response.get_json()
+    return len(statements), response.get_json()
+
+
+@pytest.mark.parametrize('query', [
+    '',
+    '&cursor=',
+    '&fields=id,total_amount,user_username&include=items',
+])
+def test_sales_list_statement_count_does_not_grow_with_page_size(seeded, client, admin_headers, query):
+    # Aquecimento: a checagem do token fica em cache depois da primeira requisição
+    count_statements(seeded, client, f'/api/sales/?per_page=1{query}', admin_headers)
+
+    counts = {}
+    for per_page in (5, 20, 50):
+        counts[per_page], body = count_statements(
+            seeded, client, f'/api/sales/?per_page={per_page}{query}', admin_headers
+        )
+        assert len(body['sales']) == per_page
+        assert all(sale['items'] for sale in body['sales'])
+
+    assert counts[5] == counts[20] == counts[50], counts
+
+
+@pytest.mark.parametrize('per_page, expected', [(-5, 20), (0, 20), (1000, 100)])
+def test_cursor_page_size_is_clamped(seeded, client, admin_headers, per_page, expected):
+    response = client.get(f'/api/sales/?per_page={per_page}&cursor=', headers=admin_headers)
+
+    body = response.get_json()
+    assert len(body['sales']) == expected
+    assert body['next_cursor']
@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from src.commands import bootstrap_database
+from src.models.database import db
+from src.models.product import Product
+from src.models.stock import StockMovement, compact_stock, reconcile_stock, record_movements, set_stock
+
+
+def create_product(client, headers, stock, name='Café'):
+    response = client.post('/api/categories/', json={'name': f'Categoria {name}'}, headers=headers)
+    assert response.status_code == 201
+    response = client.post('/api/products/', json={
+        'name': name, 'price': '2.50', 'stock': stock, 'category_id': response.get_json()['id']
+    }, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def sell(client, headers, product_id, quantity):
+    return client.post('/api/sales/', json={'items': [{'product_id': product_id, 'quantity': quantity}]}, headers=headers)
+
+
+def current_stock(app, product_id):
+    with app.app_context():
+        return db.session.get(Product, product_id).current_stock
+
+
+def test_sale_records_movement_and_refuses_oversell(app, client, admin_headers):
+    product_id = create_product(client, admin_headers, stock=5)
+
+    assert sell(client, admin_headers, product_id, 3).status_code == 201
+    assert sell(client, admin_headers, product_id, 3).status_code == 400
+    assert current_stock(app, product_id) == 2
+
+    with app.app_context():
+        movements = StockMovement.query.filter_by(product_id=product_id).order_by(StockMovement.id).all()
+        assert [(movement.reason, movement.delta) for movement in movements] == [('initial', 5), ('sale', -3)]
+
+
+def test_record_movements_reports_product_without_stock(app, client, admin_headers):
+    product_id = create_product(client, admin_headers, stock=2)
+
+    with app.app_context():
+        assert record_movements([{'product_id': product_id, 'delta': -3, 'reason': 'sale'}]) == product_id
+        db.session.rollback()
+        assert record_movements([{'product_id': product_id, 'delta': -2, 'reason': 'sale'}]) is None
+        db.session.commit()
+    assert current_stock(app, product_id) == 0
+
+
+def test_concurrent_sales_never_oversell(app, admin_headers):
+    product_id = create_product(app.test_client(), admin_headers, stock=30)
+    statuses = []
+
+    def register():
+        client = app.test_client()
+        for _ in range(15):
+            statuses.append(sell(client, admin_headers, product_id, 1).status_code)
+
+    threads = [threading.Thread(target=register) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses.count(201) == 30
+    assert statuses.count(400) == 30
+    assert current_stock(app, product_id) == 0
+
+
+def test_set_stock_writes_adjustment(app, client, admin_headers):
+    product_id = create_product(client, admin_headers, stock=10)
+    sell(client, admin_headers, product_id, 4)
+
+    with app.app_context():
+        set_stock(product_id, 9, user_id=1)
+        db.session.commit()
+        adjustment = StockMovement.query.filter_by(reason='adjustment').one()
+        assert adjustment.delta == 3
+    assert current_stock(app, product_id) == 9
+
+
+def test_compaction_folds_pending_movements(make_app):
+    app = make_app(STOCK_COMPACT_THRESHOLD=3)
+    with app.app_context():
+        bootstrap_database()
+    client = app.test_client()
+    headers = {'Authorization': 'Bearer ' + client.post(
+        '/api/auth/login', json={'username': 'admin', 'password': 'admin123'}
+    ).get_json()['access_token']}
+    product_id = create_product(client, headers, stock=20)
+
+    for _ in range(4):
+        assert sell(client, headers, product_id, 1).status_code == 201
+
+    with app.app_context():
+        product = db.session.get(Product, product_id)
+        # A 3ª movimentação pendente disparou a compactação automática
+        assert product.stock_movement_id > 1
+        assert product.current_stock == 16
+        compact_stock()
+        db.session.commit()
+        product = db.session.get(Product, product_id)
+        assert (product.stock, product.current_stock) == (16, 16)
+        assert product.stock_movement_id == db.session.query(db.func.max(StockMovement.id)).scalar()
+        assert reconcile_stock() == []
+
+
+def test_reconcile_detects_and_fixes_snapshot(app, client, admin_headers):
+    product_id = create_product(client, admin_headers, stock=7)
+
+    with app.app_context():
+        compact_stock()
+        db.session.execute(db.update(Product).values(stock=Product.stock + 1))
+        db.session.commit()
+        assert [(row[0], row[2], row[3]) for row in reconcile_stock()] == [(product_id, 8, 7)]
+        reconcile_stock(fix=True)
+        db.session.commit()
+        assert reconcile_stock() == []
+    assert current_stock(app, product_id) == 7
+
+
+@pytest.mark.parametrize('sold, status', [(False, 200), (True, 400)])
+def test_delete_product_only_without_sales(app, client, admin_headers, sold, status):
+    product_id = create_product(client, admin_headers, stock=3)
+    client.post(f'/api/products/{product_id}/restock', json={'quantity': 2}, headers=admin_headers)
+    if sold:
+        sell(client, admin_headers, product_id, 1)
+
+    assert client.delete(f'/api/products/{product_id}', headers=admin_headers).status_code == status
+    with app.app_context():
+        remaining = StockMovement.query.filter_by(product_id=product_id).count()
+    assert remaining == (3 if sold else 0)